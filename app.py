@@ -1,4 +1,6 @@
-from typing import Any
+import os
+import threading
+from typing import Any, Optional
 
 import dash
 import dash_bootstrap_components as dbc
@@ -6,6 +8,7 @@ from dash import html, dcc, Input, Output, State
 from dash_bootstrap_templates import load_figure_template
 
 from dashboard.about_me import about_me_layout
+from dashboard.elections import datastore, func
 from dashboard.elections.callbacks import (
     main_election_callbacks,
     election_sim_callbacks,
@@ -34,15 +37,48 @@ polling_callbacks.register_callbacks(app)
 election_sim_callbacks.register_callbacks(app)
 political_power_sim_callbacks.register_callbacks(app)
 
+
+@server.before_request
+def start_polling_refresher() -> None:
+    """
+    This function starts the polling refresher in the process serving the request
+
+    Starting it here rather than at import keeps it out of a gunicorn --preload master and out of
+    spawned simulation workers that re-import this module.
+    """
+    # Polling data is refreshed on the server rather than per browser session
+    datastore.polling_refresher.start()
+
+
+# The process that has started computing the general election Banzhaf index, so a forked worker
+# computes its own
+power_warmup_pid: Optional[int] = None
+
+
+@server.before_request
+def warm_general_election_power() -> None:
+    """
+    This function computes the general election Banzhaf index on a background thread, once per process
+
+    It only depends on constants, so the first Political Power tab open then reads the cached result.
+    Like the polling refresher it starts on the first request, off the import path.
+    """
+    global power_warmup_pid
+    if power_warmup_pid == os.getpid():
+        return
+
+    power_warmup_pid = os.getpid()
+    threading.Thread(
+        target=func.general_election_power, name="power-warmup", daemon=True
+    ).start()
+
+
 app.layout = html.Div(
     [
         dcc.Location(id="url", refresh=False),
         dbc.Container(
             [sidebar, html.Div(id="page-content")], className="dbc", fluid=True
         ),
-        dcc.Interval(
-            id="interval-component", interval=1, n_intervals=0, max_intervals=1
-        ),
     ]
 )
 
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class ResultCache:
+    """
+    A thread-safe LRU cache whose entries also expire after a fixed time-to-live
+
+    attributes:
+        max_entries - int: Number of entries kept before the least recently used is evicted
+        ttl_seconds - float: Seconds an entry stays valid after it is stored
+        max_bytes - int: Total size of the entries kept before the least recently used is evicted
+            (unbounded when None)
+        size_of - callable: Measures an entry's size in bytes (entries count as 0 bytes when None)
+        hits - int: Number of lookups answered from the cache
+        misses - int: Number of lookups that had to be computed
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        ttl_seconds: float = 3600,
+        max_bytes: Optional[int] = None,
+        size_of: Optional[Callable[[Any], int]] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.size_of = size_of
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, Tuple[float, Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        This function returns a cached value, or None if it is missing or expired
+
+        inputs:
+            key - hashable: The cache key
+
+        returns:
+            value - any: The cached value or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._discard(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        This function stores a value, evicting the least recently used entries when full
+
+        inputs:
+            key - hashable: The cache key
+            value - any: The value to store
+        """
+        size = self.size_of(value) if self.size_of is not None else 0
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None
+                and self._bytes > self.max_bytes
+                and len(self._entries) > 1
+            ):
+                self._discard(next(iter(self._entries)))
+
+    def _discard(self, key: Hashable) -> None:
+        # Callers hold the lock
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """
+        This function returns the cached value for a key, computing and storing it on a miss
+
+        inputs:
+            key - hashable: The cache key
+            compute - callable: Produces the value when it isn't cached
+
+        returns:
+            value - any: The cached or freshly computed value
+        """
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value)
+
+        return value
+
+    def clear(self) -> None:
+        """
+        This function removes every entry and resets the hit/miss counters
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        This function reports the cache's size and hit/miss counters
+
+        returns:
+            stats - dict: Entry count, total size in bytes, hits, misses and hit ratio
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def scenario_hash(hypo_dict: Dict[str, Any]) -> str:
+    """
+    This function builds a canonical hash of the state scenarios so equal scenarios share a cache key
+
+    inputs:
+        hypo_dict - dict: A dictionary of state code to scenario ("Trump", "Opposition" or None)
+
+    returns:
+        digest - str: A hex digest that ignores key order and states left to chance
+    """
+    scenarios = sorted((state, value) for state, value in hypo_dict.items() if value)
+
+    return hashlib.sha256(json.dumps(scenarios).encode()).hexdigest()
@@ -1,10 +1,14 @@
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Mapping, Tuple
 
 import pandas as pd
 import plotly.express as px
 from dash import Input, Output, callback_context, no_update, Dash
+from dash.exceptions import PreventUpdate
 
-from dashboard.elections import func
+from dashboard.elections import datastore, func
+from dashboard.elections.layouts.election_sim_layout import (
+    simulation_election_columns,
+)
 
 
 def register_callbacks(app: Dash) -> None:
@@ -16,33 +20,35 @@ def register_callbacks(app: Dash) -> None:
         Input("state-polls-store", "data"),
     )
     def update_state_input_table(
-        state_poll_data: List[Dict[Any, Any]]
+        state_polls_data: Dict[str, Any]
     ) -> Tuple[List[Dict[Any, Any]], int]:
         """
         This callback populates the state input table on the 'Election Simulation' tab
 
         inputs:
-            state-polls-store | state_poll_data - list(dict) : A dictionary of state polling data
+            state-polls-store | state_polls_data - dict : The state polling data
 
         returns:
             state-input-table | data list(dict): Records containing each state, it's leading candidate and their current vote %
             state-input-table | page_current int: Return 0 to reset table to first page upon update
         """
 
-        # Create dataframe(s) from store data
-        state_poll_df = pd.DataFrame(state_poll_data)
+        # Shares the standings built for the 'Current Polling' tab
+        standings, _ = datastore.dataset_view(state_polls_data, "state-standings")
 
-        # Convert date column(s) to datetime
-        state_poll_df["Date"] = pd.to_datetime(state_poll_df["Date"], utc=False)
+        # State polls haven't loaded yet
+        if standings is None:
+            raise PreventUpdate
 
         # Create visualization(s)
-        state_leaders_df = func.states_ranking_df(state_poll_df)
+        state_leaders_df = func.states_ranking_df(standings)
 
         return state_leaders_df.to_dict("records"), 0
 
     @app.callback(
         [
             Output("simulation-election-table", "data"),
+            Output("simulation-election-table", "columns"),
             Output("simulation-election-table", "page_current"),
             Output("simulation-election-bar", "figure"),
             Output("results-card", "style"),
@@ -50,24 +56,34 @@ def register_callbacks(app: Dash) -> None:
         ],
         [
             Input("trial-count-election", "value"),
+            Input("engine-election", "value"),
             Input("run-simulation-election", "n_clicks"),
             Input("state-input-table", "data"),
         ],
     )
     def update_election_simulation_figures(
-        n_trials: int, run_sim: int, state_input_df: pd.DataFrame
-    ) -> Tuple[List[Dict[Any, Any]], int, px.bar, Dict[Any, Any], str]:
+        n_trials: int, engine: str, run_sim: int, state_input_df: pd.DataFrame
+    ) -> Tuple[
+        List[Dict[Any, Any]],
+        List[Mapping[str, Any]],
+        int,
+        px.bar,
+        Dict[Any, Any],
+        str,
+    ]:
         """
         This callback updates all visualizations on the "Election Simulation" tab.
 
         inputs:
             trial-count-election | n_trials - int : Number of simulation trials to run
+            engine-election | engine - str : "monte-carlo" to sample trials or "exact" to solve the odds exactly
             run-simulation-election | n_clicks - int: Number of times the button has been pressed
             state-input-table | df: A dataframe containing the state hypo data.
 
 
         returns:
             simulation-election-table | data list(dict): Records containing each states simulation results
+            simulation-election-table | columns list(dict): The columns the engine's results have
             simulation-election-table | page_current int: Return 0 to reset table to first page upon update
             simulation-election-bar | figure: A bar graph of each state's political power
             results-card | style: Show/hide the bottom card
@@ -83,17 +99,23 @@ def register_callbacks(app: Dash) -> None:
         hypo_dict = hypo_df.to_dict()
 
         if input_id == "run-simulation-election":
-            results_df, trump_win_pct = func.election_simulation_monte_carlo(
-                int(n_trials), hypo_dict["Scenario"]
-            )
+            if engine == "exact":
+                results_df, trump_win_pct = func.election_simulation_exact(
+                    hypo_dict["Scenario"]
+                )
+            else:
+                results_df, trump_win_pct = func.election_simulation_monte_carlo(
+                    int(n_trials), hypo_dict["Scenario"]
+                )
             power_bar = func.political_power_bar(results_df)
 
             return (
                 results_df.to_dict("records"),
+                func.result_columns(simulation_election_columns, results_df),
                 0,
                 power_bar,
                 {"display": "block"},
                 format(trump_win_pct / 100, ".2%"),
             )
         else:
-            return no_update, no_update, no_update, no_update, no_update
+            return no_update, no_update, no_update, no_update, no_update, no_update
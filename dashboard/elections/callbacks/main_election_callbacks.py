@@ -1,9 +1,38 @@
 import datetime
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Optional, Tuple
 
-from dash import Input, Output, Dash
+from dash import Input, Output, State, Dash, no_update
 
-from dashboard.elections import query
+from dashboard.elections import datastore, serialization
+from dashboard.elections.constants import store_poll_seconds
+
+
+def store_data(
+    snapshot: datastore.PollingSnapshot, name: str
+) -> Optional[Dict[str, Any]]:
+    """
+    This function returns what a polling dcc.Store should hold for one dataset
+
+    By default stores hold a small version handle that callbacks resolve on the server. With
+    POLLING_STORE_MODE=client they hold the whole dataset in the compact columnar encoding.
+
+    inputs:
+        snapshot - PollingSnapshot: The current polling data
+        name - str: The polling source
+
+    returns:
+        data - dict: The handle or columnar payload, or None if the dataset has never loaded
+    """
+    if datastore.store_mode != "client":
+        return snapshot.handle(name)
+
+    df = snapshot.datasets.get(name)
+    if df is None:
+        return None
+
+    # The name tells the server which views apply; their cache key is a hash of the payload
+    # itself, since anything the browser sends back can't be trusted
+    return {**serialization.encode_columnar(df), "dataset": name}
 
 
 def register_callbacks(app: Dash) -> None:
@@ -14,44 +43,81 @@ def register_callbacks(app: Dash) -> None:
             Output("state-polls-store", "data"),
             Output("date-range", "date"),
             Output("date-range", "max_date_allowed"),
+            Output("interval-component", "disabled"),
         ],
         Input("interval-component", "n_intervals"),
+        [
+            State("national-average-store", "modified_timestamp"),
+            State("national-favorability-store", "modified_timestamp"),
+            State("state-polls-store", "modified_timestamp"),
+            State("date-range", "date"),
+        ],
     )
     def update_data_stores(
         n: int,
+        national_avg_timestamp: Optional[int],
+        national_favorability_timestamp: Optional[int],
+        state_polls_timestamp: Optional[int],
+        current_date: Optional[str],
     ) -> Tuple[
-        List[Dict[Any, Any]],
-        List[Dict[Any, Any]],
-        List[Dict[Any, Any]],
+        Dict[str, Any],
+        Dict[str, Any],
+        Dict[str, Any],
         datetime.date,
         datetime.date,
+        bool,
     ]:
         """
-        This callback populates the 3 data stores with polling data
+        This callback points the 3 data stores at the server's current polling datasets
+
+        The interval keeps polling until every store is filled, so a page opened on a cold worker
+        picks each source up as soon as it has loaded.
 
         inputs:
             n (int): Number of intervals from the interval component
+            national-average-store | modified_timestamp - int: When the store was last filled (-1 if never)
+            national-favorability-store | modified_timestamp - int: When the store was last filled (-1 if never)
+            state-polls-store | modified_timestamp - int: When the store was last filled (-1 if never)
+            date-range | date - str: The start date currently selected
 
         returns:
-            national-average-store | data - list(dict) : A list of dictionaries of national polling averages
-            national-favorability-store | data - list(dict) : A list of dictionaries of national candidate favorability polls
-            state-polls-store | data - list(dict) : A list of dictionaries of state polling data
+            national-average-store | data - dict : The national polling averages
+            national-favorability-store | data - dict : The national candidate favorability polls
+            state-polls-store | data - dict : The state polling data
             date-range  | date - datetime: 30 days prior to today
             date-range | max_date_allowed - datetime: Today's date
-
+            interval-component | disabled - bool: True once every store is filled
         """
 
-        national_avg_poll_df = query.get_national_avg_polling_data()
-        national_favorability_df = query.get_national_favorability_polling_data()
-        state_polls_df = query.get_state_polling_data()
+        # Data is loaded by the background refresher; a cold worker only waits briefly per poll
+        snapshot = datastore.polling_refresher.wait_for_snapshot(store_poll_seconds)
+
+        # Only fill stores that are still empty, so filled ones don't redraw their figures
+        stores = []
+        all_filled = True
+        for name, timestamp in (
+            ("national_avg", national_avg_timestamp),
+            ("national_favorability", national_favorability_timestamp),
+            ("state_polls", state_polls_timestamp),
+        ):
+            data = None
+            if snapshot is not None and not (timestamp is not None and timestamp > 0):
+                data = store_data(snapshot, name)
+                all_filled = all_filled and data is not None
+
+            # A source that hasn't loaded leaves its store (and dependent figures) untouched
+            stores.append(data if data is not None else no_update)
+            if snapshot is None:
+                all_filled = False
 
         date = datetime.date.today() - datetime.timedelta(days=30)
         max_date_allowed = datetime.date.today()
 
         return (
-            national_avg_poll_df.to_dict("records"),
-            national_favorability_df.to_dict("records"),
-            state_polls_df.to_dict("records"),
-            date,
+            stores[0],
+            stores[1],
+            stores[2],
+            date if current_date is None else no_update,
             max_date_allowed,
+            all_filled,
         )
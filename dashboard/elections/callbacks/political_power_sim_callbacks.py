@@ -1,10 +1,13 @@
-from typing import Any, Tuple, List, Dict
+from typing import Any, Tuple, List, Dict, Mapping
 
 import plotly.express as px
-from dash import Input, Output, callback_context, no_update, Dash
+from dash import Input, Output, State, callback_context, no_update, Dash
+from dash.exceptions import PreventUpdate
 
 from dashboard.elections import func
-from dashboard.elections.constants import electoral_votes
+from dashboard.elections.layouts.political_power_layout import (
+    simulation_power_columns,
+)
 
 
 def register_callbacks(app: Dash) -> None:
@@ -15,23 +18,41 @@ def register_callbacks(app: Dash) -> None:
             Output("banzhaf-power-table", "page_current"),
             Output("simulation-power-bar", "figure"),
             Output("simulation-power-table", "data"),
+            Output("simulation-power-table", "columns"),
             Output("simulation-power-table", "page_current"),
         ],
         [
             Input("trial-count-political-power", "value"),
+            Input("engine-political-power", "value"),
             Input("run-simulation-political-power", "n_clicks"),
+            Input("election-tabs", "active_tab"),
         ],
+        State("banzhaf-power-table", "data"),
     )
     def update_political_power_simulation_figures(
-        n_trials: int, run_sim: int
-    ) -> Tuple[px.bar, List[Dict[Any, Any]], int, px.bar, List[Dict[Any, Any]], int]:
+        n_trials: int,
+        engine: str,
+        run_sim: int,
+        active_tab: str,
+        banzhaf_data: List[Dict[Any, Any]],
+    ) -> Tuple[
+        px.bar,
+        List[Dict[Any, Any]],
+        int,
+        px.bar,
+        List[Dict[Any, Any]],
+        List[Mapping[str, Any]],
+        int,
+    ]:
         """
         This callback updates all visualizations on the "Election Simulation" tab.
 
         inputs:
             trial-count-political-power | n_trials - int : Number of simulation trials to run
+            engine-political-power | engine - str : "monte-carlo" to sample trials or "exact" to solve the odds exactly
             run-simulation-political-power | n_clicks - int: Number of times the button has been pressed
-
+            election-tabs | active_tab - str: The dashboard tab currently shown
+            banzhaf-power-table | data - list(dict): The Banzhaf results already shown, if any
 
         returns:
             banzhaf-power-bar | figure: A bar graph of each state's political power in the general election
@@ -39,17 +60,21 @@ def register_callbacks(app: Dash) -> None:
             banzhaf-power-table | page_current int: Return 0 to reset table to first page upon update
             simulation-power-bar | figure: A bar graph of each state's political power
             simulation-power-table | data list(dict): Records containing each states simulation results
+            simulation-power-table | columns list(dict): The columns the engine's results have
             simulation-power-table | page_current int: Return 0 to reset table to first page upon update
         """
 
         ctx = callback_context
         input_id = ctx.triggered[0]["prop_id"].split(".")[0]
 
-        # Callback triggered by button click - return monte carlo results only
+        # Callback triggered by button click - return primary election results only
         if input_id == "run-simulation-political-power":
-            results_df = func.primary_election_power_monte_carlo(
-                int(n_trials),
-            )
+            if engine == "exact":
+                results_df = func.primary_election_power_exact()
+            else:
+                results_df = func.primary_election_power_monte_carlo(
+                    int(n_trials),
+                )
             power_bar = func.political_power_bar(results_df)
             return (
                 no_update,
@@ -57,30 +82,41 @@ def register_callbacks(app: Dash) -> None:
                 no_update,
                 power_bar,
                 results_df.to_dict("records"),
+                func.result_columns(simulation_power_columns, results_df),
                 0,
             )
 
-        # Callback triggered by selecting trial # in dropdown -- do nothing
-        elif input_id == "trial-count-political-power":
-            return no_update, no_update, no_update, no_update, no_update, no_update
+        # Callback triggered by selecting trial # or engine in dropdown -- do nothing
+        elif input_id in ("trial-count-political-power", "engine-political-power"):
+            return (
+                no_update,
+                no_update,
+                no_update,
+                no_update,
+                no_update,
+                no_update,
+                no_update,
+            )
+
+        # Callback triggered by page load or a tab change -- populate everything the first time
+        # the tab is opened, so the other tabs never wait on these calculations
+        elif active_tab != "political-power-tab" or banzhaf_data:
+            raise PreventUpdate
 
-        # Callback triggered by initial load -- populate everything
         else:
-            # Calculate Banzhaf PI for general election and create visualization
-            power_df = func.banzhaf(electoral_votes, 270)
-            ge_power_bar = func.political_power_bar(power_df)
+            # The general election Banzhaf PI and its visualization are computed once per process
+            power_records, ge_power_bar = func.general_election_power()
 
-            # Run Primary election monte carlo and create visualization
-            results_df = func.primary_election_power_monte_carlo(
-                int(n_trials),
-            )
+            # Solve the primary election exactly so first load is instant and deterministic
+            results_df = func.primary_election_power_exact()
             power_bar = func.political_power_bar(results_df)
 
             return (
                 ge_power_bar,
-                power_df.to_dict("records"),
+                power_records,
                 0,
                 power_bar,
                 results_df.to_dict("records"),
+                func.result_columns(simulation_power_columns, results_df),
                 0,
             )
@@ -1,96 +1,256 @@
 import datetime
+from dataclasses import replace
 from typing import Any, Dict, List, Tuple
 
-import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from dash import Input, Output, Dash
+from dash.exceptions import PreventUpdate
 
-from dashboard.elections import func
+from dashboard.elections import datastore, func
+from dashboard.elections.figure_cache import cached_figure
+from dashboard.elections.rolling import default_spec, rolling_specs
 
 
 def register_callbacks(app: Dash) -> None:
+    # Each figure has its own callback listening only to the inputs it uses, so changing one input
+    # rebuilds only the figures that depend on it and Dash can request them in parallel
+
     @app.callback(
-        [
-            Output("candidate-voting-kpi-card", "figure"),
-            Output("party-voting-pie", "figure"),
-            Output("candidate-voting-trend", "figure"),
-            Output("candidate-favorability-kpi-card", "figure"),
-            Output("candidate-favorability-trend", "figure"),
-            Output("party-favorability-bar", "figure"),
-        ],
+        Output("candidate-voting-kpi-card", "figure"),
         [
             Input("national-average-store", "data"),
-            Input("national-favorability-store", "data"),
             Input("candidate-select", "value"),
             Input("date-range", "date"),
         ],
     )
-    def update_national_polling_figures(
-        national_avg_data: List[Dict[Any, Any]],
-        national_favorability_data: List[Dict[Any, Any]],
+    def update_candidate_voting_kpi_card(
+        national_avg_data: Dict[str, Any],
         candidate: str,
         start_date: datetime.date,
-    ) -> Tuple[go.Figure, go.Figure, go.Figure, go.Figure, go.Figure, px.bar,]:
+    ) -> go.Figure:
         """
-        This callback updates all visualizations on the 'Current Polling' tab
+        This callback updates the candidate's voting KPI card on the 'Current Polling' tab
 
         inputs:
-            national-average-store | national_avg_data - list(dict) : A dictionary of national polling averages
-            national-favorability-store | national_favorability_data - list(dict) : A dictionary of national candidate favorability polls
+            national-average-store | national_avg_data - dict : The national polling averages
             candidate-select | value -  str: Candidate selected in dropdown component
             date-range  | start_date - datetime: Start date selected by user in dropdown component
-            state-select | state - datetime: State selected by user in dropdown
 
         returns:
             candidate-voting-kpi-card | figure: A KPI card containing the candidate's current position and vote %
-            party-voting-pie | figure: A pie chart of the entire field's vote %
-            candidate-voting-trend | figure: A historical line graph containing the actual poll data and a rolling average
-            candidate-favorability-kpi-card | figure: A KPI card containing the canddiate's current favorability and unfavorability data
-            candidate-favorability-trend | figure: A line graph containing the average favorable v unfavorable for the candidate
-            party-favorability-bar | figure: A stacked bar chart of the entire field's favorability and unfavorability
+        """
+        national_avg_views, version = datastore.dataset_view(
+            national_avg_data, "national-avg-views"
+        )
+
+        # Skip the figure if its data source failed to load
+        if national_avg_views is None:
+            raise PreventUpdate
 
+        return cached_figure(
+            national_avg_data,
+            version,
+            "candidate-voting-kpi-card",
+            (candidate, str(start_date)),
+            lambda: func.candidate_voting_kpi_card(
+                national_avg_views.kpis, candidate, start_date
+            ),
+        )
+
+    @app.callback(
+        Output("party-voting-pie", "figure"),
+        Input("national-average-store", "data"),
+    )
+    def update_party_voting_pie(national_avg_data: Dict[str, Any]) -> go.Figure:
         """
+        This callback updates the field's voting pie chart on the 'Current Polling' tab
 
-        # Create dataframe(s) from store data
-        national_avg_poll_df = pd.DataFrame(national_avg_data)
-        national_favorability_df = pd.DataFrame(national_favorability_data)
+        inputs:
+            national-average-store | national_avg_data - dict : The national polling averages
 
-        # Convert date column(s) to datetime
-        national_avg_poll_df["Date"] = pd.to_datetime(
-            national_avg_poll_df["Date"], utc=False
+        returns:
+            party-voting-pie | figure: A pie chart of the entire field's vote %
+        """
+        national_avg_views, version = datastore.dataset_view(
+            national_avg_data, "national-avg-views"
         )
-        national_favorability_df["Date"] = pd.to_datetime(
-            national_favorability_df["Date"], utc=False
+
+        # Skip the figure if its data source failed to load
+        if national_avg_views is None:
+            raise PreventUpdate
+
+        return cached_figure(
+            national_avg_data,
+            version,
+            "party-voting-pie",
+            (),
+            lambda: func.party_voting_pie(national_avg_views),
         )
 
-        # Create visualizations
-        candidate_voting_kpi_card = func.candidate_voting_kpi_card(
-            national_avg_poll_df, candidate, start_date
+    @app.callback(
+        Output("candidate-voting-trend", "figure"),
+        [
+            Input("national-average-store", "data"),
+            Input("candidate-select", "value"),
+            Input("date-range", "date"),
+            Input("rolling-select", "value"),
+        ],
+    )
+    def update_candidate_voting_trend(
+        national_avg_data: Dict[str, Any],
+        candidate: str,
+        start_date: datetime.date,
+        rolling_average: str,
+    ) -> go.Figure:
+        """
+        This callback updates the candidate's voting trend on the 'Current Polling' tab
+
+        inputs:
+            national-average-store | national_avg_data - dict : The national polling averages
+            candidate-select | value -  str: Candidate selected in dropdown component
+            date-range  | start_date - datetime: Start date selected by user in dropdown component
+            rolling-select | rolling_average - str: Rolling average selected by user in dropdown component
+
+        returns:
+            candidate-voting-trend | figure: A historical line graph containing the actual poll data and a rolling average
+        """
+        # Rolling averages are computed once per data version and spec. The national averages
+        # have no sample sizes, so weighted options average them equally under the unweighted spec
+        spec = replace(rolling_specs.get(rolling_average, default_spec), weight=None)
+        voting_trend, version = datastore.trend_view(national_avg_data, spec)
+
+        # Skip the figure if its data source failed to load
+        if voting_trend is None:
+            raise PreventUpdate
+
+        return cached_figure(
+            national_avg_data,
+            version,
+            "candidate-voting-trend",
+            (spec, candidate, str(start_date)),
+            lambda: func.candidate_voting_trend(voting_trend, candidate, start_date),
         )
-        party_voting_pie = func.party_voting_pie(national_avg_poll_df)
 
-        candidate_voting_trend = func.candidate_voting_trend(
-            national_avg_poll_df, candidate, start_date
+    @app.callback(
+        Output("candidate-favorability-kpi-card", "figure"),
+        [
+            Input("national-favorability-store", "data"),
+            Input("candidate-select", "value"),
+            Input("date-range", "date"),
+        ],
+    )
+    def update_candidate_favorability_kpi_card(
+        national_favorability_data: Dict[str, Any],
+        candidate: str,
+        start_date: datetime.date,
+    ) -> go.Figure:
+        """
+        This callback updates the candidate's favorability KPI card on the 'Current Polling' tab
+
+        inputs:
+            national-favorability-store | national_favorability_data - dict : The national candidate favorability polls
+            candidate-select | value -  str: Candidate selected in dropdown component
+            date-range  | start_date - datetime: Start date selected by user in dropdown component
+
+        returns:
+            candidate-favorability-kpi-card | figure: A KPI card containing the canddiate's current favorability and unfavorability data
+        """
+        favorability_views, version = datastore.dataset_view(
+            national_favorability_data, "favorability-views"
         )
 
-        candidate_favorability_kpi_card = func.candidate_favorability_kpi_card(
-            national_favorability_df, candidate, start_date
+        # Skip the figure if its data source failed to load
+        if favorability_views is None:
+            raise PreventUpdate
+
+        return cached_figure(
+            national_favorability_data,
+            version,
+            "candidate-favorability-kpi-card",
+            (candidate, str(start_date)),
+            lambda: func.candidate_favorability_kpi_card(
+                favorability_views.kpis, candidate, start_date
+            ),
         )
 
-        candidate_favorability_trend = func.candidate_favorability_trend(
-            national_favorability_df, candidate, start_date
+    @app.callback(
+        Output("candidate-favorability-trend", "figure"),
+        [
+            Input("national-favorability-store", "data"),
+            Input("candidate-select", "value"),
+            Input("date-range", "date"),
+            Input("rolling-select", "value"),
+        ],
+    )
+    def update_candidate_favorability_trend(
+        national_favorability_data: Dict[str, Any],
+        candidate: str,
+        start_date: datetime.date,
+        rolling_average: str,
+    ) -> go.Figure:
+        """
+        This callback updates the candidate's favorability trend on the 'Current Polling' tab
+
+        inputs:
+            national-favorability-store | national_favorability_data - dict : The national candidate favorability polls
+            candidate-select | value -  str: Candidate selected in dropdown component
+            date-range  | start_date - datetime: Start date selected by user in dropdown component
+            rolling-select | rolling_average - str: Rolling average selected by user in dropdown component
+
+        returns:
+            candidate-favorability-trend | figure: A line graph containing the average favorable v unfavorable for the candidate
+        """
+        # Rolling averages are computed once per data version and spec
+        spec = rolling_specs.get(rolling_average, default_spec)
+        favorability_trend, version = datastore.trend_view(
+            national_favorability_data, spec
         )
-        party_favorability_bar = func.party_favorability_stacked_bar(
-            national_favorability_df
+
+        # Skip the figure if its data source failed to load
+        if favorability_trend is None:
+            raise PreventUpdate
+
+        return cached_figure(
+            national_favorability_data,
+            version,
+            "candidate-favorability-trend",
+            (spec, candidate, str(start_date)),
+            lambda: func.candidate_favorability_trend(
+                favorability_trend, candidate, start_date
+            ),
         )
-        return (
-            candidate_voting_kpi_card,
-            party_voting_pie,
-            candidate_voting_trend,
-            candidate_favorability_kpi_card,
-            candidate_favorability_trend,
-            party_favorability_bar,
+
+    @app.callback(
+        Output("party-favorability-bar", "figure"),
+        Input("national-favorability-store", "data"),
+    )
+    def update_party_favorability_bar(
+        national_favorability_data: Dict[str, Any]
+    ) -> px.bar:
+        """
+        This callback updates the field's favorability bar chart on the 'Current Polling' tab
+
+        inputs:
+            national-favorability-store | national_favorability_data - dict : The national candidate favorability polls
+
+        returns:
+            party-favorability-bar | figure: A stacked bar chart of the entire field's favorability and unfavorability
+        """
+        favorability_views, version = datastore.dataset_view(
+            national_favorability_data, "favorability-views"
+        )
+
+        # Skip the figure if its data source failed to load
+        if favorability_views is None:
+            raise PreventUpdate
+
+        return cached_figure(
+            national_favorability_data,
+            version,
+            "party-favorability-bar",
+            (),
+            lambda: func.party_favorability_stacked_bar(favorability_views),
         )
 
     @app.callback(
@@ -105,14 +265,14 @@ def register_callbacks(app: Dash) -> None:
         ],
     )
     def update_state_polling_figures(
-        state_poll_data: List[Dict[Any, Any]],
+        state_polls_data: Dict[str, Any],
         state: str,
     ) -> Tuple[px.choropleth, List[Dict[Any, Any]], int,]:
         """
         This callback updates all state polling visualizations on the 'Current Polling' tab
 
         inputs:
-            state-polls-store | state_poll_data - list(dict) : A dictionary of state polling data
+            state-polls-store | state_polls_data - dict : The state polling data
             state-select | state - datetime: State selected by user in dropdown
 
         returns:
@@ -121,15 +281,23 @@ def register_callbacks(app: Dash) -> None:
             state-table | page_current int: Return 0 to reset table to first page upon state change
 
         """
-        # Create dataframe(s) from store data
-        state_poll_df = pd.DataFrame(state_poll_data)
+        # Standings and the map are built once per version of the state polling data
+        standings, version = datastore.dataset_view(state_polls_data, "state-standings")
+
+        # State polls haven't loaded yet
+        if standings is None:
+            raise PreventUpdate
 
-        # Convert date column(s) to datetime
-        state_poll_df["Date"] = pd.to_datetime(state_poll_df["Date"], utc=False)
+        state_standing_map = cached_figure(
+            state_polls_data,
+            version,
+            "state-standing-map",
+            (),
+            lambda: func.state_standing_map(standings),
+        )
 
         # Create visualizations
-        state_standing_df = func.state_ranking_df(state_poll_df, state)
-        state_standing_map = func.state_standing_map(state_poll_df)
+        state_standing_df = func.state_ranking_df(standings, state)
 
         return (
             state_standing_map,
@@ -73,6 +73,9 @@ states["NJ"] = {"Delegates": 49}
 states["NM"] = {"Delegates": 22}
 states["SD"] = {"Delegates": 29}
 
+# Delegates required to clinch the nomination (a majority of the 2467 above)
+delegate_threshold = 1234
+
 # State Order
 state_order_list = [
     "IA",
@@ -187,6 +190,9 @@ electoral_votes = [
     3,
 ]
 
+# Electoral votes required to win the general election (a majority of the 538 above)
+electoral_vote_quota = 270
+
 electoral_state_order = [
     "AL",
     "AK",
@@ -241,6 +247,19 @@ electoral_state_order = [
     "WY",
 ]
 
+# Electoral vote apportionments compared in power index sweeps: name -> (states, electoral votes)
+apportionment_scenarios = {
+    "Current": (electoral_state_order, electoral_votes),
+    "No DC": (
+        [state for state in electoral_state_order if state != "DC"],
+        [
+            votes
+            for state, votes in zip(electoral_state_order, electoral_votes)
+            if state != "DC"
+        ],
+    ),
+}
+
 
 state_code_mapping = {
     "Alabama": "AL",
@@ -296,6 +315,28 @@ state_code_mapping = {
     "Wyoming": "WY",
 }
 
+# FiveThirtyEight polling datasets
+national_avg_poll_url = (
+    "https://projects.fivethirtyeight.com/polls/data/presidential_primary_averages.csv"
+)
+national_favorability_url = (
+    "https://projects.fivethirtyeight.com/polls-page/data/favorability_polls.csv"
+)
+state_polls_url = (
+    "https://projects.fivethirtyeight.com/polls-page/data/president_primary_polls.csv"
+)
+
+# Seconds between a page's polls for polling data its worker hasn't loaded yet, which is also the
+# longest each poll waits on a cold worker
+store_poll_seconds = 2
+
+# Seconds each polling source may take before its figures are skipped
+polling_source_timeouts = {
+    "national_avg": 30,
+    "national_favorability": 30,
+    "state_polls": 45,
+}
+
 candidate_names = {"Nikki Haley": "Haley", "Donald Trump": "Trump"}
 import_columns = [
     "candidate",
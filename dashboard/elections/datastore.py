@@ -0,0 +1,624 @@
+import datetime
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from dashboard.elections import query, serialization, views
+from dashboard.elections.cache import ResultCache
+from dashboard.elections.rolling import RollingSpec, default_spec
+from dashboard.elections.standings import state_standings
+from dashboard.elections.constants import polling_source_timeouts
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Each polling source and the loader that fetches and parses it
+polling_sources: Dict[str, Callable[..., pd.DataFrame]] = {
+    "national_avg": query.get_national_avg_polling_data,
+    "national_favorability": query.get_national_favorability_polling_data,
+    "state_polls": query.get_state_polling_data,
+}
+
+# Number of recent versions of each dataset kept for handles already handed out
+history_size = 3
+
+# "server" keeps datasets on the server behind handles; "client" ships them to the browser
+# in the compact columnar encoding for deployments where workers don't share data
+store_mode = os.environ.get("POLLING_STORE_MODE", "server")
+
+# Views derived from a dataset keyed by (view, dataset, version); versions are content hashes so
+# entries never go stale, they just stop being asked for
+derived_views = ResultCache(max_entries=64, ttl_seconds=24 * 60 * 60)
+
+# Views built from each dataset as soon as it loads: view name -> (build, extend). extend updates
+# the previous version's view from the new dataset and its row hashes when a refresh only added
+# rows, returning None when it can't
+materialized_views: Dict[
+    str,
+    Dict[
+        str,
+        Tuple[
+            Callable[[pd.DataFrame], Any],
+            Optional[Callable[[Any, pd.DataFrame, npt.NDArray[np.uint64]], Any]],
+        ],
+    ],
+] = {
+    "national_avg": {
+        "national-avg-views": (views.national_avg_views, None),
+    },
+    "national_favorability": {
+        "favorability-views": (
+            views.favorability_views,
+            views.extend_favorability_views,
+        ),
+    },
+    "state_polls": {
+        "state-standings": (state_standings, None),
+    },
+}
+
+# Rolling trends of each dataset: the builder for any RollingSpec, and the materialized view
+# whose trend attribute already holds the default one
+trend_views: Dict[
+    str, Tuple[Callable[[pd.DataFrame, RollingSpec], pd.DataFrame], str]
+] = {
+    "national_avg": (views.voting_trend, "national-avg-views"),
+    "national_favorability": (views.favorability_trend, "favorability-views"),
+}
+
+# How often the server re-downloads the polling data
+refresh_interval_seconds = float(os.environ.get("POLLING_REFRESH_SECONDS", 15 * 60))
+
+
+def load_polling_sources(
+    on_loaded: Optional[Callable[[str, pd.DataFrame], None]] = None
+) -> Dict[str, Optional[pd.DataFrame]]:
+    """
+    This function fetches and parses every polling source concurrently
+
+    A source that errors or exceeds its timeout is returned as None so only the figures that depend on it are skipped.
+
+    inputs:
+        on_loaded - callable: Called with each source's name and dataframe as soon as it has loaded
+
+    returns:
+        datasets - dict: Each source's dataframe, or None if it could not be loaded
+    """
+    executor = ThreadPoolExecutor(max_workers=len(polling_sources))
+    started = time.monotonic()
+    futures = {
+        executor.submit(loader, timeout=polling_source_timeouts[name]): name
+        for name, loader in polling_sources.items()
+    }
+
+    # Every source gets its own deadline from submission, so the waits overlap rather than add up;
+    # the download itself is bounded by the timeout, allow the same again for parsing
+    deadlines = {
+        future: started + 2 * polling_source_timeouts[name]
+        for future, name in futures.items()
+    }
+
+    datasets: Dict[str, Optional[pd.DataFrame]] = {}
+    pending = set(futures)
+    while pending:
+        now = time.monotonic()
+        for future in [future for future in pending if deadlines[future] <= now]:
+            logger.error("Timed out loading %s polling data", futures[future])
+            pending.discard(future)
+        if not pending:
+            break
+
+        done, pending = wait(
+            pending,
+            timeout=min(deadlines[future] for future in pending) - now,
+            return_when=FIRST_COMPLETED,
+        )
+        for future in done:
+            name = futures[future]
+            try:
+                datasets[name] = future.result()
+            except Exception:
+                logger.exception("Failed to load %s polling data", name)
+                continue
+
+            if on_loaded is not None:
+                try:
+                    on_loaded(name, datasets[name])
+                except Exception:
+                    logger.exception("Failed to publish %s polling data", name)
+
+    # Don't hold the caller open for a source that has already timed out
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    return {name: datasets.get(name) for name in polling_sources}
+
+
+@dataclass(frozen=True)
+class PollingSnapshot:
+    """
+    An immutable set of polling datasets shared by every callback in this process
+
+    attributes:
+        version - int: Increases by one every time the snapshot is replaced
+        loaded_at - datetime: When the snapshot was built
+        datasets - dict: Each source's dataframe, or None if it has never loaded
+        dataset_versions - dict: Each loaded source's content hash
+    """
+
+    version: int
+    loaded_at: datetime.datetime
+    datasets: Mapping[str, Optional[pd.DataFrame]]
+    dataset_versions: Mapping[str, str]
+
+    def handle(self, name: str) -> Optional[Dict[str, str]]:
+        """
+        This function returns the small token a dcc.Store holds in place of a dataset
+
+        inputs:
+            name - str: The polling source
+
+        returns:
+            handle - dict: The source name and content version, or None if it has never loaded
+        """
+        if name not in self.dataset_versions:
+            return None
+
+        return {"dataset": name, "version": self.dataset_versions[name]}
+
+
+def dataset_version(
+    df: pd.DataFrame, hashes: Optional[npt.NDArray[np.uint64]] = None
+) -> str:
+    """
+    This function hashes a dataframe's contents so identical data gets the same version on every worker
+
+    inputs:
+        df - dataframe: A polling dataset
+        hashes - array: The dataset's row hashes, if they have already been computed
+
+    returns:
+        version - str: A short hex digest of the rows and columns
+    """
+    if hashes is None:
+        hashes = views.row_hashes(df)
+
+    digest = hashlib.sha256(hashes.tobytes())
+    digest.update(",".join(map(str, df.columns)).encode())
+
+    return digest.hexdigest()[:16]
+
+
+def materialize_views(
+    datasets: Mapping[str, Optional[pd.DataFrame]],
+    dataset_versions: Mapping[str, str],
+    previous_versions: Mapping[str, str],
+    row_hashes: Mapping[str, npt.NDArray[np.uint64]],
+) -> None:
+    """
+    This function builds the materialized views of every dataset whose version changed
+
+    A view of the previous version is extended with the added rows when its dataset supports it and
+    the refresh only added rows; otherwise the view is rebuilt. A view that fails to build is left
+    for derived_view to build on demand.
+
+    inputs:
+        datasets - dict: Each source's dataframe, or None if it has never loaded
+        dataset_versions - dict: Each loaded source's content hash
+        previous_versions - dict: Each source's content hash in the previous snapshot
+        row_hashes - dict: The row hashes behind each changed source's version
+    """
+    for name, version in dataset_versions.items():
+        previous_version = previous_versions.get(name)
+        df = datasets[name]
+        if version == previous_version or df is None:
+            continue
+
+        for view, (build, extend) in materialized_views.get(name, {}).items():
+            try:
+                value = None
+                previous_value = (
+                    derived_views.get((view, name, previous_version))
+                    if extend is not None and previous_version is not None
+                    else None
+                )
+                if extend is not None and previous_value is not None:
+                    hashes = row_hashes.get(name)
+                    value = extend(
+                        previous_value,
+                        df,
+                        hashes if hashes is not None else views.row_hashes(df),
+                    )
+                if value is None:
+                    value = build(df)
+                derived_views.set((view, name, version), value)
+            except Exception:
+                logger.exception("Failed to build the %s view of %s", view, name)
+
+
+class PollingRefresher:
+    """
+    Refreshes the polling datasets on a background thread, independent of any browser session
+
+    Callbacks only read the latest snapshot, so serving a page never waits on the network once the
+    first load has finished.
+
+    attributes:
+        interval_seconds - float: Seconds between refreshes
+    """
+
+    def __init__(
+        self,
+        loader: Callable[
+            [Callable[[str, pd.DataFrame], None]], Dict[str, Optional[pd.DataFrame]]
+        ] = load_polling_sources,
+        interval_seconds: float = refresh_interval_seconds,
+    ) -> None:
+        self.interval_seconds = interval_seconds
+        self._loader = loader
+        self._snapshot: Optional[PollingSnapshot] = None
+        self._history: OrderedDict[Tuple[str, str], pd.DataFrame] = OrderedDict()
+        self._loaded = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        # Threads don't survive a fork, so a child of a process that already started (e.g. a
+        # gunicorn --preload master) must be able to start its own
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self) -> None:
+        loaded = self._loaded.is_set()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._loaded = threading.Event()
+        if loaded:
+            self._loaded.set()
+
+    def start(self) -> None:
+        """
+        This function starts the background refresh thread in this process, loading the data immediately
+
+        It is safe to call on every request; only the first call in each process starts the thread.
+        """
+        if self._thread is not None:
+            return
+
+        with self._lock:
+            if self._thread is not None:
+                return
+
+            self._thread = threading.Thread(
+                target=self._run, name="polling-refresher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        This function asks the background refresh thread to exit after its current load
+        """
+        self._stop.set()
+
+    def refresh(self) -> PollingSnapshot:
+        """
+        This function loads every source, publishing each one in a new snapshot as soon as it loads
+
+        A source that fails to load keeps its dataframe from the previous snapshot, and a cold worker
+        can serve the sources that have loaded while a slow one is still downloading.
+
+        returns:
+            snapshot - PollingSnapshot: The latest snapshot once every source has loaded or failed
+        """
+        published = set()
+
+        def publish(name: str, df: pd.DataFrame) -> None:
+            self._publish({name: df})
+            published.add(name)
+
+        datasets = self._loader(publish)
+
+        # Publish anything the loader returned without announcing it
+        snapshot = self._publish(
+            {name: df for name, df in datasets.items() if name not in published}
+        )
+        self._loaded.set()
+
+        return snapshot
+
+    def _publish(
+        self, datasets: Mapping[str, Optional[pd.DataFrame]]
+    ) -> PollingSnapshot:
+        # Only the refresh thread replaces the snapshot, so it can be read without the lock
+        previous = self._snapshot
+        previous_versions: Mapping[str, str] = (
+            previous.dataset_versions if previous is not None else {}
+        )
+
+        # Failed sources and unchanged data keep the previous dataframe. The row hashes behind
+        # each version also let views spot refreshes that only added rows
+        row_hashes = {
+            name: views.row_hashes(df)
+            for name, df in datasets.items()
+            if df is not None
+        }
+        loaded_versions = {
+            name: dataset_version(datasets[name], hashes)
+            for name, hashes in row_hashes.items()
+        }
+        changed = {
+            name: version
+            for name, version in loaded_versions.items()
+            if version != previous_versions.get(name)
+        }
+        if previous is not None and not changed:
+            return previous
+
+        merged: Dict[str, Optional[pd.DataFrame]] = {
+            name: previous.datasets.get(name) if previous is not None else None
+            for name in polling_sources
+        }
+        merged.update({name: datasets[name] for name in changed})
+        dataset_versions = {**previous_versions, **changed}
+
+        # Build views before publishing so callbacks never see a version without them
+        materialize_views(merged, dataset_versions, previous_versions, row_hashes)
+
+        with self._lock:
+            # Keep a few recent versions so pages holding an older handle stay consistent
+            for name in changed:
+                self._history[(name, dataset_versions[name])] = merged[name]
+                self._history.move_to_end((name, dataset_versions[name]))
+            while len(self._history) > history_size * len(polling_sources):
+                self._history.popitem(last=False)
+
+            self._snapshot = PollingSnapshot(
+                version=previous.version + 1 if previous is not None else 1,
+                loaded_at=datetime.datetime.now(),
+                datasets=merged,
+                dataset_versions=dataset_versions,
+            )
+
+            return self._snapshot
+
+    def snapshot(self) -> Optional[PollingSnapshot]:
+        """
+        This function returns the latest snapshot without waiting
+
+        returns:
+            snapshot - PollingSnapshot: The latest snapshot, or None before the first source loads
+        """
+        return self._snapshot
+
+    def wait_for_snapshot(self, timeout: float) -> Optional[PollingSnapshot]:
+        """
+        This function returns the latest snapshot, waiting for the first load if it hasn't finished
+
+        inputs:
+            timeout - float: Seconds to wait for the first load
+
+        returns:
+            snapshot - PollingSnapshot: The latest snapshot, which may not hold every source yet if the
+                first load is still running, or None if no source has loaded
+        """
+        self._loaded.wait(timeout)
+
+        return self._snapshot
+
+    def resolve(
+        self, handle: Optional[Mapping[str, str]]
+    ) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+        """
+        This function turns a dataset handle from a dcc.Store back into its typed dataframe
+
+        A handle for a version this process no longer holds (or never held, e.g. one issued by
+        another worker that refreshed first) resolves to the latest snapshot of the same dataset, so
+        the version actually served is returned alongside it.
+
+        inputs:
+            handle - dict: The source name and content version held by the store
+
+        returns:
+            df - dataframe: The dataset, or None if the handle is empty or the dataset has never loaded
+            version - str: The content version of df, or None when df is None
+        """
+        if not handle:
+            return None, None
+
+        with self._lock:
+            version: Optional[str] = handle["version"]
+            df = self._history.get((handle["dataset"], handle["version"]))
+            if df is None and self._snapshot is not None:
+                df = self._snapshot.datasets.get(handle["dataset"])
+                version = self._snapshot.dataset_versions.get(handle["dataset"])
+
+        return df, version if df is not None else None
+
+    def served_version(self, handle: Optional[Mapping[str, str]]) -> Optional[str]:
+        """
+        This function returns the version resolve would serve for a handle without touching the data
+
+        inputs:
+            handle - dict: The source name and content version held by the store
+
+        returns:
+            version - str: The content version served for the handle, or None if there is none
+        """
+        return self.resolve(handle)[1]
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Polling data refresh failed")
+
+            self._stop.wait(self.interval_seconds)
+
+
+polling_refresher = PollingRefresher()
+
+
+def resolve_dataset(
+    store_data: Optional[Mapping[str, Any]]
+) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+    """
+    This function turns the data held by a polling dcc.Store into a typed dataframe
+
+    inputs:
+        store_data - dict: A dataset handle, or a columnar payload when the data is kept on the client
+
+    returns:
+        df - dataframe: The dataset, or None if the store is empty or the dataset has never loaded
+        version - str: The content version of df, which may differ from the one the store named
+    """
+    if serialization.is_columnar(store_data):
+        return serialization.decode_columnar(dict(store_data or {})), served_version(
+            store_data
+        )
+
+    return polling_refresher.resolve(store_data)
+
+
+def served_version(store_data: Optional[Mapping[str, Any]]) -> Optional[str]:
+    """
+    This function returns the content version of the data this worker serves for a dcc.Store
+
+    Anything cached per version must be keyed on this rather than on the version the store names,
+    which this worker may not hold.
+
+    inputs:
+        store_data - dict: A dataset handle or columnar payload held by a dcc.Store
+
+    returns:
+        version - str: The version served, or None if the store is empty or the dataset has never loaded
+    """
+    # Columnar payloads come from the browser, so their version is derived from what was sent
+    if serialization.is_columnar(store_data):
+        return serialization.payload_version(dict(store_data or {}))
+
+    return polling_refresher.served_version(store_data)
+
+
+def derived_view(
+    store_data: Optional[Mapping[str, Any]],
+    view: Hashable,
+    build: Callable[[pd.DataFrame], T],
+) -> Tuple[Optional[T], Optional[str]]:
+    """
+    This function returns a view derived from a polling dataset, building it once per dataset version
+
+    The version is returned with the view, so anything cached from the view is keyed on the data it
+    was built from even if a refresh lands in between.
+
+    inputs:
+        store_data - dict: A dataset handle or columnar payload held by a dcc.Store
+        view - hashable: Identifies the view, unique per build function
+        build - callable: Derives the view from the dataset's dataframe
+
+    returns:
+        value - any: The view, or None if the store is empty or the dataset has never loaded
+        version - str: The content version the view was built from, or None if there is none
+    """
+    if not store_data:
+        return None, None
+
+    version = served_version(store_data)
+    if version is None:
+        df, _ = resolve_dataset(store_data)
+        return (build(df) if df is not None else None), None
+
+    key = (view, store_data.get("dataset"), version)
+    value = derived_views.get(key)
+    if value is None:
+        df, resolved_version = resolve_dataset(store_data)
+        if df is None:
+            return None, None
+        value = build(df)
+
+        # A refresh between the two lookups can change the data served; don't file it under the
+        # wrong version
+        if resolved_version == version:
+            derived_views.set(key, value)
+
+        return value, resolved_version
+
+    return value, version
+
+
+def dataset_view(
+    store_data: Optional[Mapping[str, Any]], view: str
+) -> Tuple[Any, Optional[str]]:
+    """
+    This function returns one of a dataset's materialized views
+
+    inputs:
+        store_data - dict: A dataset handle or columnar payload held by a dcc.Store
+        view - str: Name of the view in materialized_views
+
+    returns:
+        value - any: The view, or None if the store is empty or the dataset has never loaded
+        version - str: The content version the view was built from, or None if there is none
+    """
+    # Columnar payloads name their dataset themselves, so an unknown name is just missing data
+    dataset_views = materialized_views.get(str((store_data or {}).get("dataset")), {})
+    if not store_data or view not in dataset_views:
+        return None, None
+
+    build, _ = dataset_views[view]
+
+    return derived_view(store_data, view, build)
+
+
+def trend_view(
+    store_data: Optional[Mapping[str, Any]], spec: RollingSpec
+) -> Tuple[Optional[views.CandidateSeries], Optional[str]]:
+    """
+    This function returns a dataset's rolling trend, computed once per dataset version and spec
+
+    inputs:
+        store_data - dict: A dataset handle or columnar payload held by a dcc.Store
+        spec - RollingSpec: The rolling average to apply
+
+    returns:
+        trend - CandidateSeries: The trend by candidate and date, or None if the store is empty or
+            the dataset has never loaded
+        version - str: The content version the trend was built from, or None if there is none
+    """
+    if not store_data or store_data.get("dataset") not in trend_views:
+        return None, None
+
+    build, materialized = trend_views[store_data["dataset"]]
+    if spec == default_spec:
+        value, version = dataset_view(store_data, materialized)
+        return (
+            cast(Optional[views.CandidateSeries], getattr(value, "trend", None)),
+            version,
+        )
+
+    return derived_view(
+        store_data,
+        ("trend", spec),
+        lambda df: views.candidate_series(build(df, spec)),
+    )
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Where downloaded CSVs are kept between requests and restarts
+default_cache_dir = Path(
+    os.environ.get(
+        "POLLING_DATA_CACHE_DIR",
+        Path.home() / ".cache" / "election-dashboard",
+    )
+)
+
+
+def cached_path(url: str, cache_dir: Path) -> Path:
+    """
+    This function returns the on-disk location of a URL's cached copy
+
+    inputs:
+        url - str: The remote file's URL
+        cache_dir - Path: Directory holding cached downloads
+
+    returns:
+        path - Path: File path of the cached copy (it may not exist yet)
+    """
+    digest = hashlib.sha256(url.encode()).hexdigest()[:16]
+    name = url.rstrip("/").rsplit("/", 1)[-1] or "download"
+
+    return cache_dir / f"{digest}-{name}"
+
+
+def write_atomic(path: Path, content: bytes) -> None:
+    """
+    This function replaces a file's content in one step, so readers never see a partial write
+
+    inputs:
+        path - Path: The file to write
+        content - bytes: The file's new content
+    """
+    fd, partial_path = tempfile.mkstemp(dir=path.parent, suffix=".partial")
+    try:
+        with os.fdopen(fd, "wb") as partial_file:
+            partial_file.write(content)
+        os.replace(partial_path, path)
+    except BaseException:
+        os.unlink(partial_path)
+        raise
+
+
+def read_meta(meta_path: Path) -> Dict[str, Any]:
+    """
+    This function reads the validators saved alongside a cached copy
+
+    inputs:
+        meta_path - Path: The cached copy's metadata file
+
+    returns:
+        meta - dict: The saved url, etag and last_modified, or empty if the file is missing or unreadable
+    """
+    try:
+        meta = json.loads(meta_path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+    return meta if isinstance(meta, dict) else {}
+
+
+def fetch_csv(
+    url: str,
+    cache_dir: Optional[Union[str, Path]] = None,
+    timeout: float = 30,
+) -> Path:
+    """
+    This function downloads a CSV to a local cache, revalidating any cached copy with a conditional GET
+
+    A cached copy is re-used when the server answers 304 Not Modified, and is served as-is when the
+    server can't be reached or returns an error.
+
+    inputs:
+        url - str: The remote CSV's URL
+        cache_dir - Path: Directory holding cached downloads (defaults to POLLING_DATA_CACHE_DIR)
+        timeout - float: Seconds to wait on the server before falling back to the cached copy
+
+    returns:
+        path - Path: File path of an up to date (or last known good) copy of the CSV
+    """
+    directory = Path(cache_dir) if cache_dir is not None else default_cache_dir
+    directory.mkdir(parents=True, exist_ok=True)
+
+    path = cached_path(url, directory)
+    meta_path = path.with_name(path.name + ".meta.json")
+
+    headers: Dict[str, str] = {}
+    if path.exists():
+        # Unreadable metadata is treated as missing, so the copy is simply downloaded again
+        meta = read_meta(meta_path)
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        response = requests.get(url, headers=headers, timeout=timeout)
+        if response.status_code == 304 and path.exists():
+            return path
+        response.raise_for_status()
+    except requests.RequestException:
+        if path.exists():
+            logger.warning("Could not refresh %s, serving cached copy", url)
+            return path
+        raise
+
+    # Write to temporary files first so readers never see a partial download or metadata
+    write_atomic(path, response.content)
+    write_atomic(
+        meta_path,
+        json.dumps(
+            {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+        ).encode(),
+    )
+
+    return path
@@ -0,0 +1,54 @@
+import json
+from typing import Any, Callable, Hashable, Mapping, Optional, Tuple
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from dashboard.elections.cache import ResultCache
+
+# Serialized figures keyed by (figure, dataset, version of their views, inputs); a new data version changes
+# every key, so figures of an old version are never served and age out of the LRU
+figure_cache = ResultCache(
+    max_entries=2048,
+    ttl_seconds=24 * 60 * 60,
+    max_bytes=64 * 1024 * 1024,
+    size_of=len,
+)
+
+
+def cached_figure(
+    store_data: Optional[Mapping[str, Any]],
+    version: Optional[str],
+    figure: str,
+    inputs: Tuple[Hashable, ...],
+    build: Callable[[], go.Figure],
+) -> Any:
+    """
+    This function returns a figure built from a polling dataset, building it once per data version and inputs
+
+    The figure is kept as the JSON Dash sends to the browser, so a hit skips both building and
+    validating the Plotly figure.
+
+    inputs:
+        store_data - dict: The dataset handle or columnar payload the figure is built from
+        version - str: The content version of the views the figure is built from, as returned with
+            them by datastore.dataset_view or datastore.trend_view
+        figure - str: Identifies the figure, unique per build function
+        inputs - tuple: The callback inputs the figure depends on besides the data
+        build - callable: Builds the figure
+
+    returns:
+        figure - dict: The figure's JSON representation
+    """
+    # Keyed on the version the views came from, never the one the store claims or one read after
+    # them, which a refresh in between could have moved on
+    if not store_data or version is None:
+        return build()
+
+    key = (figure, store_data.get("dataset"), version, inputs)
+    encoded = figure_cache.get(key)
+    if encoded is None:
+        encoded = pio.to_json(build(), validate=False)
+        figure_cache.set(key, encoded)
+
+    return json.loads(encoded)
@@ -1,53 +1,54 @@
+import functools
+import json
 from copy import copy
 from datetime import date
-from random import randint
-from typing import Any, Tuple, List
+from typing import Any, Dict, Mapping, Sequence, Tuple, List, Optional
 
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-
+import plotly.io as pio
+
+from dashboard.elections import power_index, simulation
+from dashboard.elections.cache import ResultCache, scenario_hash
+from dashboard.elections.standings import StateStandings
+from dashboard.elections.views import (
+    CandidateSeries,
+    FavorabilityKpis,
+    FavorabilityViews,
+    NationalAvgViews,
+    VotingKpis,
+)
 from dashboard.elections.constants import (
     color_mapping_dict,
-    states,
     state_order_list,
     electoral_votes,
+    electoral_vote_quota,
     electoral_state_order,
 )
 
+# Apportionment batches at least this large are spread across the process pool by default
+parallel_scenario_threshold = 8
+
+# Simulation results keyed by (engine, trial count, scenario hash, seed)
+simulation_cache = ResultCache(max_entries=256, ttl_seconds=60 * 60)
 
-def state_standing_map(state_poll_df: pd.DataFrame) -> px.bar:
+
+def state_standing_map(standings: StateStandings) -> px.bar:
     """
     This function creates a choropleth map displaying the current poll leader in each state
 
     inputs:
-        state_poll_df - dataframe : A dataframe of state poll data
+        standings - StateStandings : Each candidate's latest poll in every state
 
     returns:
         fig | figure: A choropleth map displaying the current poll leader in each state
 
     """
-    df = copy(state_poll_df)
-
-    df = df[df["notes"] != "head-to-head poll"]
-
-    df = df.loc[df.groupby(["Code", "Candidate"]).Date.idxmax()].sort_values(
-        ["Percentage"], ascending=False
-    )
-
-    df.sort_values(["Code", "Percentage"], ascending=[True, True], inplace=True)
-    df["shift"] = df.groupby("Code")["Percentage"].shift()
-    df["Diff"] = df.groupby(["Code"])["Percentage"].transform(lambda x: x.diff())
-
-    df.sort_values(
-        ["Code", "Percentage", "Diff"], ascending=[True, False, True], inplace=True
-    )
-    df = df[["Code", "Candidate", "Percentage", "Diff"]]
-    df = df.groupby("Code").first()
-    df.reset_index(inplace=True)
-
     fig = px.choropleth(
-        df,
+        standings.leaders,
         locationmode="USA-states",
         locations="Code",
         color="Candidate",
@@ -60,13 +61,13 @@ def state_standing_map(state_poll_df: pd.DataFrame) -> px.bar:
 
 
 def candidate_voting_trend(
-    national_avg_poll_df: pd.DataFrame, candidate: str, start_date: date
+    trend: CandidateSeries, candidate: str, start_date: date
 ) -> go.Figure:
     """
     This function creates a historical line graph of candidate vote pct and a 5 day rolling average.
 
     inputs:
-        national_avg_poll_df - dataframe: A dataframe of the national average poll data
+        trend - CandidateSeries: Every candidate's national average poll data and its rolling average
         candidate - str: Candidate to filter by
         start_date - datetime: Beginning date of data to plot
 
@@ -75,18 +76,8 @@ def candidate_voting_trend(
 
     """
 
-    df = copy(national_avg_poll_df)
-
-    # Filter by candidate
-    df = df[df["Candidate"] == candidate].sort_values("Date", ascending=True)
-
-    # Calculate rolling average
-    df["Rolling"] = df.groupby(["Candidate"])["Percentage"].transform(
-        lambda x: x.rolling(5).mean()
-    )
-
-    # Date filter
-    df = df[df["Date"] >= (pd.to_datetime(start_date))]
+    # Slice of the candidate's rows from the start date on; the rolling average is already computed
+    df = trend.since(candidate, start_date)
 
     fig = go.Figure()
     fig.add_trace(
@@ -116,13 +107,13 @@ def candidate_voting_trend(
 
 
 def candidate_favorability_trend(
-    national_favorability_df: pd.DataFrame, candidate: str, start_date: date
+    trend: CandidateSeries, candidate: str, start_date: date
 ) -> go.Figure:
     """
      This function creates a historical line graph of candidate favorability vs unfavorability.
 
     inputs:
-        national_favorability_df - dataframe: A dataframe of the national favorability poll data
+        trend - CandidateSeries: Every candidate's rolling favorable and unfavorable averages
         candidate - str: Candidate to filter by
         start_date - datetime: Beginning date of data to plot
 
@@ -130,56 +121,22 @@ def candidate_favorability_trend(
         fig | figure: A historical line graph of candidate favorability vs unfavorability.
 
     """
-    df = copy(national_favorability_df)
-
-    favorable_df = df.copy()
-    unfavorable_df = df.copy()
-
-    favorable_df = (
-        favorable_df.groupby(["Candidate", "Date"])["Favorable"]
-        .mean()
-        .round(2)
-        .reset_index()
-    )
-    unfavorable_df = (
-        unfavorable_df.groupby(["Candidate", "Date"])["Unfavorable"]
-        .mean()
-        .round(2)
-        .reset_index()
-    )
-
-    favorable_df = favorable_df[favorable_df["Candidate"] == candidate].sort_values(
-        "Date", ascending=True
-    )
-    unfavorable_df = unfavorable_df[
-        unfavorable_df["Candidate"] == candidate
-    ].sort_values("Date", ascending=True)
-
-    favorable_df["Rolling Favorable"] = favorable_df.groupby(["Candidate"])[
-        "Favorable"
-    ].transform(lambda x: x.rolling(5).mean())
-    unfavorable_df["Rolling Unfavorable"] = unfavorable_df.groupby(["Candidate"])[
-        "Unfavorable"
-    ].transform(lambda x: x.rolling(5).mean())
-
-    favorable_df = favorable_df[favorable_df["Date"] >= (pd.to_datetime(start_date))]
-    unfavorable_df = unfavorable_df[
-        unfavorable_df["Date"] >= (pd.to_datetime(start_date))
-    ]
+    # Slice of the candidate's rows from the start date on; the rolling averages are already computed
+    df = trend.since(candidate, start_date)
 
     fig = go.Figure()
     fig.add_trace(
         go.Line(
-            x=unfavorable_df["Date"],
-            y=unfavorable_df["Rolling Unfavorable"],
+            x=df["Date"],
+            y=df["Rolling Unfavorable"],
             name="Unfavorable",
             line=dict(color="red"),
         )
     )
     fig.add_trace(
         go.Line(
-            x=favorable_df["Date"],
-            y=favorable_df["Rolling Favorable"],
+            x=df["Date"],
+            y=df["Rolling Favorable"],
             name="Favorable",
             line=dict(color="blue"),
         )
@@ -193,12 +150,12 @@ def candidate_favorability_trend(
     return fig
 
 
-def party_favorability_stacked_bar(national_favorability_df: pd.DataFrame) -> px.bar:
+def party_favorability_stacked_bar(favorability_views: FavorabilityViews) -> px.bar:
     """
     This function creates a stacked bar of favorable vs unfavorable for the entire candidate field
 
     inputs:
-        national_favorability_df - dataframe: A dataframe of the national favorability poll data
+        favorability_views - FavorabilityViews: Views of the national favorability poll data
 
 
     returns:
@@ -206,11 +163,7 @@ def party_favorability_stacked_bar(national_favorability_df: pd.DataFrame) -> px
 
     """
 
-    df = copy(national_favorability_df)
-
-    df.sort_values("Date", inplace=True, ascending=True)
-
-    df = df.loc[df.groupby(["Candidate"]).Date.idxmax()]
+    df = favorability_views.latest
 
     fig = px.bar(
         df,
@@ -233,23 +186,22 @@ def party_favorability_stacked_bar(national_favorability_df: pd.DataFrame) -> px
     return fig
 
 
-def party_voting_pie(national_avg_poll_df: pd.DataFrame) -> go.Figure:
+def party_voting_pie(national_avg_views: NationalAvgViews) -> go.Figure:
     """
     This function creates a pie chart of the current standing of all republican candidates
 
     inputs:
-        national_avg_poll_df - dataframe: A dataframe of the national average poll data
+        national_avg_views - NationalAvgViews: Views of the national average poll data
 
     returns:
         fig - figure: A pie chart of current vote % for the entire field
 
     """
 
-    df = copy(national_avg_poll_df)
-
-    df = df.loc[df.groupby(["Candidate"]).Date.idxmax()]
+    df = national_avg_views.latest.copy()
 
     # Append a row for undecided voters
+    df["Candidate"] = df["Candidate"].astype(object)
     df.loc[-1] = ["Undecided", None, (100 - df["Percentage"].sum()), None, None, 2024]
 
     # go.Pie doesn't accept a dictionary -- colors must be in order of slices
@@ -280,13 +232,13 @@ def party_voting_pie(national_avg_poll_df: pd.DataFrame) -> go.Figure:
 
 
 def candidate_favorability_kpi_card(
-    national_favorability_df: pd.DataFrame, candidate: str, start_date: date
+    kpis: FavorabilityKpis, candidate: str, start_date: date
 ) -> go.Figure:
     """
     This function creates the KPI card of candidate favorability data
 
     inputs:
-        national_favorability_df - dataframe: A dataframe of the national favorability poll data
+        kpis - FavorabilityKpis: Every candidate's latest poll and first poll since every date
         candidate - str: Candidate to filter by
         start_date - datetime: Beginning date of data to plot
 
@@ -294,17 +246,11 @@ def candidate_favorability_kpi_card(
         fig - figure: A figure containing a KPI card of acandidate's favorability data
     """
 
-    df = copy(national_favorability_df)
+    current_result = kpis.current(candidate)
+    if current_result is None:
+        return go.Figure()
 
-    df = df[df["Candidate"] == candidate]
-
-    current_result = df.loc[df.Date.idxmax()]
-
-    past_result = (
-        df[df["Date"] >= (pd.to_datetime(start_date))]
-        .sort_values("Date", ascending=False)
-        .iloc[-1]
-    )
+    past_result = kpis.at(candidate, start_date) or current_result
 
     fig = go.Figure()
     fig.add_trace(
@@ -330,13 +276,13 @@ def candidate_favorability_kpi_card(
 
 
 def candidate_voting_kpi_card(
-    national_avg_poll_df: pd.DataFrame, candidate: str, start_date: date
+    kpis: VotingKpis, candidate: str, start_date: date
 ) -> go.Figure:
     """
     This function creates the KPI card of a candidate's vote percent and position in the race
 
     inputs:
-        national_avg_poll_df - dataframe: A dataframe of the national average poll data
+        kpis - VotingKpis: Every candidate's position and vote % on every polling date
         candidate - str: Candidate to filter by
         start_date - datetime: Beginning date of data to plot
 
@@ -344,42 +290,14 @@ def candidate_voting_kpi_card(
         fig - figure: A figure containing a KPI card of acandidate's vote and position data
     """
 
-    current_result = copy(national_avg_poll_df)
-    current_result = current_result[current_result["Date"] == current_result.Date.max()]
-    current_result["Rank"] = (
-        current_result.sort_values(["Percentage"], ascending=False)
-        .groupby(["Candidate"], sort=False)
-        .ngroup()
-        + 1
-    )
-    current_result = current_result[current_result["Candidate"] == candidate]
-    current_result = current_result.loc[current_result.Date.idxmax()]
-
-    past_result = copy(national_avg_poll_df)
-    past_result = past_result[
-        past_result["Date"] >= (pd.to_datetime(start_date))
-    ].sort_values("Date", ascending=False)
-
-    past_result = past_result[past_result["Date"] == past_result.Date.min()]
-    past_result["Rank"] = (
-        past_result.sort_values(["Percentage"], ascending=False)
-        .groupby(["Candidate"], sort=False)
-        .ngroup()
-        + 1
-    )
-    past_result = past_result[past_result["Candidate"] == candidate]
-
-    past_rank = 0
-    past_pct = 0
-    if not past_result.empty:
-        past_rank = past_result["Rank"].values[0]
-        past_pct = past_result["Percentage"].values[0]
+    current_rank, current_pct = kpis.current(candidate)
+    past_rank, past_pct = kpis.at(candidate, start_date)
 
     fig = go.Figure()
     fig.add_trace(
         go.Indicator(
             mode="number+delta",
-            value=int(current_result["Rank"]),
+            value=current_rank,
             domain={"x": [0, 1], "y": [0.5, 1]},
             delta={"reference": past_rank, "position": "right"},
             title={"text": "Position"},
@@ -389,7 +307,7 @@ def candidate_voting_kpi_card(
     fig.add_trace(
         go.Indicator(
             mode="number+delta",
-            value=current_result["Percentage"],
+            value=current_pct,
             delta={"position": "right", "reference": past_pct, "valueformat": ".2f"},
             domain={"x": [0, 1], "y": [0, 0.5]},
             title={"text": "Vote %"},
@@ -400,75 +318,58 @@ def candidate_voting_kpi_card(
     return fig
 
 
-def state_ranking_df(state_poll_df: pd.DataFrame, state: str) -> pd.DataFrame:
+def state_ranking_df(standings: StateStandings, state: str) -> pd.DataFrame:
     """
     This function creates a dataframe containing a state's current poll data
 
     inputs:
-        state_poll_df - dataframe: A dataframe of state polling data
+        standings - StateStandings: Each candidate's latest poll in every state
         state - str: A state to filter by
 
     returns:
         df - dataframe: A dataframe containing a state's current poll data
     """
 
-    df = copy(state_poll_df)
-
-    df = df[df["notes"] != "head-to-head poll"]
-    df = df.loc[df.groupby(["Code", "Candidate"]).Date.idxmax()].sort_values(
-        ["Percentage"], ascending=False
-    )
-
-    df.sort_values(["Code", "Percentage"], ascending=[True, True], inplace=True)
-    df["shift"] = df.groupby("Code")["Percentage"].shift()
-    df["Diff"] = df.groupby(["Code"])["Percentage"].transform(lambda x: x.diff())
-
-    df.sort_values(
-        ["Code", "Percentage", "Diff"], ascending=[True, False, True], inplace=True
-    )
-    df = df[["Code", "Candidate", "Percentage", "Diff"]]
-
-    df = df[df["Code"] == state]
-
-    return df
+    return standings.state(state)
 
 
-def states_ranking_df(state_poll_df: pd.DataFrame) -> pd.DataFrame:
+def states_ranking_df(standings: StateStandings) -> pd.DataFrame:
     """
     This function calculates the current leader of each state
 
     inputs:
-        state_poll_df - dataframe: A dataframe of state polling data
+        standings - StateStandings: Each candidate's latest poll in every state
 
     returns:
         df - dataframe: A dataframe containing the current leader of each state
     """
 
-    df = copy(state_poll_df)
-
-    df = df[df["notes"] != "head-to-head poll"]
-    df = df.loc[df.groupby(["Code", "Candidate"]).Date.idxmax()].sort_values(
-        ["Percentage"], ascending=False
-    )
-
-    df.sort_values(["Code", "Percentage"], ascending=[True, True], inplace=True)
-    df["shift"] = df.groupby("Code")["Percentage"].shift()
-    df["Diff"] = df.groupby(["Code"])["Percentage"].transform(lambda x: x.diff())
-
-    df.sort_values(
-        ["Code", "Percentage", "Diff"], ascending=[True, False, True], inplace=True
-    )
-    df = df[["Code", "Candidate", "Percentage", "Diff"]]
+    df = standings.leaders.copy()
     df["Scenario"] = None
 
-    df = df.groupby("Code").first()
-
     df2 = pd.DataFrame({"Code": state_order_list}, columns=["Code"])
     new_df = df2.merge(df, how="left", left_on="Code", right_on="Code")
 
     return new_df
 
 
+def result_columns(
+    columns: Sequence[Mapping[str, Any]], results_df: pd.DataFrame
+) -> List[Mapping[str, Any]]:
+    """
+    This function picks the table columns a set of simulation results actually has
+
+    inputs:
+        columns - list(dict): Every column the results table can show
+        results_df - dataframe: The simulation results, which differ by engine
+
+    returns:
+        columns - list(dict): The columns present in the results, in table order
+    """
+
+    return [column for column in columns if column["id"] in results_df.columns]
+
+
 def political_power_bar(results_df: pd.DataFrame) -> px.bar:
     """
     This function creates a bar chart of each state's political power
@@ -488,205 +389,263 @@ def political_power_bar(results_df: pd.DataFrame) -> px.bar:
     return fig
 
 
-def banzhaf(weight: List[int], quota: int) -> pd.DataFrame:
+def banzhaf(
+    weight: List[int], quota: int, labels: Optional[List[str]] = None
+) -> pd.DataFrame:
     """
     This function caLculates the banzhaf power index for a list of weights and a quota
 
     inputs:
         weight - List[int] : A list of weights
         quota - int: Number of votes required to win
+        labels - List[str]: Name of each weight (defaults to the states in electoral vote order)
 
     returns:
-        power_df - List[float]: A dataframe of states and their power index
-
-    From https://gist.github.com/HeinrichHartmann/8ec2e2245f2a70441257
-
-    """
-    max_order = sum(weight)
-
-    polynomial = [1] + max_order * [
-        0
-    ]  # create a list to hold the polynomial coefficients
-
-    current_order = 0  # compute the polynomial coefficients
-    aux_polynomial = polynomial[:]
-    for i in range(len(weight)):
-        current_order = current_order + weight[i]
-        offset_polynomial = weight[i] * [0] + polynomial
-        for j in range(current_order + 1):
-            aux_polynomial[j] = polynomial[j] + offset_polynomial[j]
-        polynomial = aux_polynomial[:]
-
-    banzhaf_power = len(weight) * [
-        0
-    ]  # create a list to hold the Banzhaf Power for each voter
-    swings = quota * [0]  # create a list to compute the swings for each voter
-
-    for i in range(len(weight)):  # compute the Banzhaf Power
-        for j in range(quota):  # fill the swings list
-            if j < weight[i]:
-                swings[j] = polynomial[j]
-            else:
-                swings[j] = polynomial[j] - swings[j - weight[i]]
-        for k in range(weight[i]):  # fill the Banzhaf Power vector
-            banzhaf_power[i] = banzhaf_power[i] + swings[quota - 1 - k]
-
-    # Normalize Index
-    total_power = float(sum(banzhaf_power))
-    banzhaf_index = list(map(lambda x: x / total_power, banzhaf_power))
-
-    # Create a dictionary of states, their electoral votes, and power index
-    general_election_power = {}
-    for i in range(len(banzhaf_index)):
-        general_election_power[electoral_state_order[i]] = {
-            "Electoral Votes": electoral_votes[i],
-            "Power": banzhaf_index[i],
+        power_df - dataframe: A dataframe of states, their weights and their power index, from most
+            to least powerful
+    """
+    power_df = pd.DataFrame(
+        {
+            "State": electoral_state_order if labels is None else labels,
+            "Electoral Votes": weight,
+            "Power": power_index.banzhaf_index(weight, quota),
         }
-
-    # Convert to a pandas dataframe and cleanup
-    power_df = pd.DataFrame.from_dict(general_election_power, orient="index")
-    power_df.reset_index(inplace=True)
-    power_df.rename(columns={"index": "State", 0: "Power"}, inplace=True)
+    )
     power_df.sort_values(by="Power", ascending=False, inplace=True)
 
     return power_df
 
 
-def primary_election_power_monte_carlo(n_trials: int) -> pd.DataFrame:
+def banzhaf_scenarios(
+    scenarios: Mapping[str, Tuple[Sequence[str], Sequence[int]]],
+    quotas: Sequence[int],
+    parallel: Optional[bool] = None,
+) -> pd.DataFrame:
     """
-    This function performs a monte carlo simulation of political power of the republican primary election
+    This function calculates the banzhaf power index of every state for each apportionment scenario and quota
+
+    Each scenario builds its generating polynomial once for all of the quotas, and scenarios run
+    across the process pool when there are enough of them to outweigh the overhead.
 
     inputs:
-        n_trials - int: Numbermn of trials to run in the simulation
+        scenarios - dict: Scenario name -> (state codes, electoral votes of each state)
+        quotas - List[int]: Numbers of votes required to win
+        parallel - bool: Run the scenarios across the process pool (defaults to large batches only)
 
     returns:
-        results_df - dataframe: A dataframe of simulation results
-
+        power_df - dataframe: One row per scenario, quota and state with its electoral votes and power
     """
+    names = list(scenarios)
+    weights = [list(scenarios[name][1]) for name in names]
 
-    states_ordered_dict = copy(states)
+    if parallel is None:
+        parallel = (
+            len(names) >= parallel_scenario_threshold and simulation.pool_workers > 1
+        )
 
-    for state in states_ordered_dict:
-        states_ordered_dict[state]["Winning Coalition Count"] = 0
+    if parallel:
+        results = simulation.pool_map(
+            power_index.banzhaf_sweep, weights, [list(quotas)] * len(names)
+        )
+    else:
+        results = [power_index.banzhaf_sweep(weight, quotas) for weight in weights]
+
+    return pd.concat(
+        [
+            pd.DataFrame(
+                {
+                    "Scenario": name,
+                    "Quota": np.tile(quotas, len(weight)),
+                    "State": np.repeat(list(scenarios[name][0]), len(quotas)),
+                    "Electoral Votes": np.repeat(weight, len(quotas)),
+                    "Power": power.reshape(-1),
+                }
+            )
+            for name, weight, power in zip(names, weights, results)
+        ],
+        ignore_index=True,
+    )
 
-    red_team_wins = 0
-    blue_team_wins = 0
 
-    # Number of Simulations
-    trial_count = n_trials
-    for trials in range(0, trial_count):
-        red_sum = 0
-        blue_sum = 0
+@functools.lru_cache(maxsize=None)
+def general_election_power() -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    This function calculates the general election Banzhaf power index and its bar chart once per process
 
-        for state in states_ordered_dict:
-            states_ordered_dict[state]["Win Tally"] = 0
+    Both depend only on constants, so every page view shares the same results. They are returned
+    ready to send to the browser and must not be modified.
 
-        # Iterate over each state in order by when they vote
-        for state in states_ordered_dict:
-            # 1237 delegates means we have a nominee
-            if red_sum < 1234 and blue_sum < 1234:
-                rand_int = randint(0, 1)
+    returns:
+        records - list(dict): Each state's electoral votes and power index, from most to least powerful
+        figure - dict: The JSON of a bar chart of each state's power index
+    """
+    power_df = banzhaf(electoral_votes, electoral_vote_quota)
+    figure = json.loads(pio.to_json(political_power_bar(power_df), validate=False))
 
-                if rand_int == 0:
-                    red_sum += states_ordered_dict[state]["Delegates"]
-                    states_ordered_dict[state]["Win Tally"] = 1
-                else:
-                    blue_sum += states_ordered_dict[state]["Delegates"]
-            else:
-                break
+    return power_df.to_dict("records"), figure
 
-        if red_sum >= 1234:
-            for state in states_ordered_dict:
-                if states_ordered_dict[state]["Win Tally"] == 1:
-                    states_ordered_dict[state]["Winning Coalition Count"] += 1
-            red_team_wins += 1
-        else:
-            blue_team_wins += 1
 
-    results_df = pd.DataFrame.from_dict(states, orient="index").sort_values(
-        ["Winning Coalition Count"], ascending=False
-    )
+def simulation_results_df(counts: npt.NDArray[np.int64], n_trials: int) -> pd.DataFrame:
+    """
+    This function converts winning coalition counts into the simulation results table
+
+    inputs:
+        counts - ndarray(int): Number of trials in which each state was part of the winning coalition
+        n_trials - int: Number of trials run in the simulation
+
+    returns:
+        results_df - dataframe: A dataframe of simulation results
+    """
+
+    results_df = pd.DataFrame(
+        {
+            "State": simulation.primary_model.state_codes,
+            "Delegates": simulation.primary_model.delegates,
+            "Winning Coalition Count": counts,
+        }
+    ).sort_values(["Winning Coalition Count"], ascending=False)
     results_df["Winning Coalition Pct"] = (
-        results_df["Winning Coalition Count"] / trial_count
+        results_df["Winning Coalition Count"] / n_trials
     )
     results_df["Power"] = (
         results_df["Winning Coalition Count"]
         / results_df["Winning Coalition Count"].sum()
     )
-    results_df.reset_index(inplace=True)
-    results_df.rename(columns={"index": "State"}, inplace=True)
+    results_df.reset_index(drop=True, inplace=True)
+
+    return results_df
+
+
+def primary_election_power_monte_carlo(
+    n_trials: int, seed: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    This function performs a monte carlo simulation of political power of the republican primary election
+
+    inputs:
+        n_trials - int: Number of trials to run in the simulation
+        seed - int: Optional root seed for the random number generators
+
+    returns:
+        results_df - dataframe: A dataframe of simulation results
+
+    """
+
+    # Political power is the election simulation with every state left to chance
+    results_df, _ = election_simulation_monte_carlo(n_trials, {}, seed)
 
     return results_df
 
 
 def election_simulation_monte_carlo(
-    n_trials: int, hypo_dict: dict[str, Any]
+    n_trials: int, hypo_dict: dict[str, Any], seed: Optional[int] = None
 ) -> Tuple[pd.DataFrame, float]:
     """
     This function performs a monte carlo simulation of the republican primary election
 
     inputs:
-        n_trials - int: Numbermn of trials to run in the simulation
+        n_trials - int: Number of trials to run in the simulation
         hypo_dict - dic: A dictionary containing state hypo data.
+        seed - int: Optional root seed for the random number generators
 
     returns:
         df - dataframe: A dataframe of simulation results
         trump_win_pct - float: A percentage of trials won
     """
 
-    states_ordered_dict = copy(states)
-
-    for state in states_ordered_dict:
-        states_ordered_dict[state]["Winning Coalition Count"] = 0
-
-    trumpWins = 0
-    oppositionWins = 0
-
-    # Number of Simulations
-    trial_count = n_trials
-    for trials in range(0, trial_count):
-        trumpSum = 0
-        blueSum = 0
-
-        for state in states_ordered_dict:
-            states_ordered_dict[state]["Win Tally"] = 0
-
-        # Iterate over each state in order by when they vote
-        for state in states_ordered_dict:
-            # 1237 delegates means we have a nominee
-            if trumpSum < 1234 and blueSum < 1234:
-                randomNum = randint(0, 1)
-                scenario = hypo_dict[state]
-
-                if scenario == "Trump":
-                    trumpSum += states_ordered_dict[state]["Delegates"]
-                    states_ordered_dict[state]["Win Tally"] = 1
-                elif scenario == "Opposition":
-                    blueSum += states_ordered_dict[state]["Delegates"]
-                elif randomNum == 0:
-                    trumpSum += states_ordered_dict[state]["Delegates"]
-                    states_ordered_dict[state]["Win Tally"] = 1
-                else:
-                    blueSum += states_ordered_dict[state]["Delegates"]
-            else:
-                break
-
-        if trumpSum >= 1234:
-            for state in states_ordered_dict:
-                if states_ordered_dict[state]["Win Tally"] == 1:
-                    states_ordered_dict[state]["Winning Coalition Count"] += 1
-            trumpWins += 1
-        elif blueSum >= 1234:
-            oppositionWins += 1
-
-    trump_win_pct = (trumpWins / trial_count) * 100
-
-    df = pd.DataFrame.from_dict(states, orient="index").sort_values(
-        ["Winning Coalition Count"], ascending=False
+    def run() -> Tuple[pd.DataFrame, float]:
+        # Resolve the scenarios once instead of re-checking them in every trial
+        forced_trump, forced_opposition = simulation.scenario_masks(
+            simulation.primary_model.state_codes, hypo_dict
+        )
+
+        # Each call gets its own generators; the shared delegate model is read-only
+        # so concurrent simulations can't interfere with each other
+        counts, trump_wins = simulation.simulate_primary(
+            n_trials,
+            simulation.primary_model.delegates,
+            seed,
+            forced_trump,
+            forced_opposition,
+        )
+
+        return simulation_results_df(counts, n_trials), (trump_wins / n_trials) * 100
+
+    df, trump_win_pct = simulation_cache.get_or_compute(
+        ("monte-carlo", n_trials, scenario_hash(hypo_dict), seed), run
+    )
+
+    return df.copy(), trump_win_pct
+
+
+def exact_results_df(membership: npt.NDArray[np.float64]) -> pd.DataFrame:
+    """
+    This function converts exact winning coalition probabilities into the simulation results table
+
+    inputs:
+        membership - ndarray(float): Probability each state is part of the winning coalition
+
+    returns:
+        results_df - dataframe: A dataframe of each state's winning coalition probability and power
+    """
+
+    results_df = pd.DataFrame(
+        {
+            "State": simulation.primary_model.state_codes,
+            "Delegates": simulation.primary_model.delegates,
+            "Winning Coalition Pct": membership,
+        }
+    ).sort_values(["Winning Coalition Pct"], ascending=False)
+    results_df["Power"] = (
+        results_df["Winning Coalition Pct"] / results_df["Winning Coalition Pct"].sum()
+    )
+    results_df.reset_index(drop=True, inplace=True)
+
+    return results_df
+
+
+def primary_election_power_exact() -> pd.DataFrame:
+    """
+    This function calculates the exact political power of each state in the republican primary election
+
+    returns:
+        results_df - dataframe: A dataframe of each state's winning coalition probability and power
+    """
+
+    # Political power is the election simulation with every state left to chance
+    results_df, _ = election_simulation_exact({})
+
+    return results_df
+
+
+def election_simulation_exact(hypo_dict: dict[str, Any]) -> Tuple[pd.DataFrame, float]:
+    """
+    This function solves the republican primary election exactly instead of sampling it
+
+    inputs:
+        hypo_dict - dic: A dictionary containing state hypo data.
+
+    returns:
+        df - dataframe: A dataframe of each state's winning coalition probability and power
+        trump_win_pct - float: Trump's probability of winning as a percentage
+    """
+
+    def run() -> Tuple[pd.DataFrame, float]:
+        forced_trump, forced_opposition = simulation.scenario_masks(
+            simulation.primary_model.state_codes, hypo_dict
+        )
+        trump_probability = np.where(
+            forced_trump, 1.0, np.where(forced_opposition, 0.0, 0.5)
+        )
+
+        win_probability, membership = simulation.exact_primary(
+            simulation.primary_model.delegates, trump_probability
+        )
+
+        return exact_results_df(membership), win_probability * 100
+
+    df, trump_win_pct = simulation_cache.get_or_compute(
+        ("exact", None, scenario_hash(hypo_dict), None), run
     )
-    df["Winning Coalition Pct"] = df["Winning Coalition Count"] / trial_count
-    df["Power"] = df["Winning Coalition Count"] / df["Winning Coalition Count"].sum()
-    df.reset_index(inplace=True)
-    df.rename(columns={"index": "State"}, inplace=True)
 
-    return df, trump_win_pct
+    return df.copy(), trump_win_pct
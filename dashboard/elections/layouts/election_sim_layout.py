@@ -57,25 +57,29 @@ state_input_table = dash_table.DataTable(
     },
 )
 
+# Every column a simulation result can have; the callback shows the ones its engine produced, since
+# exact results have no coalition count
+simulation_election_columns = [
+    {"name": "State", "id": "State"},
+    {"name": "Delegates", "id": "Delegates"},
+    {"name": "Winning Coalition Count", "id": "Winning Coalition Count"},
+    {
+        "name": "Winning Coalition Pct",
+        "id": "Winning Coalition Pct",
+        "type": "numeric",
+        "format": dash_table.FormatTemplate.percentage(2),
+    },
+    {
+        "name": "Power",
+        "id": "Power",
+        "type": "numeric",
+        "format": dash_table.FormatTemplate.percentage(2),
+    },
+]
+
 simulation_election_table = dash_table.DataTable(
     id="simulation-election-table",
-    columns=[
-        {"name": "State", "id": "State"},
-        {"name": "Delegates", "id": "Delegates"},
-        {"name": "Winning Coalition Count", "id": "Winning Coalition Count"},
-        {
-            "name": "Winning Coalition Pct",
-            "id": "Winning Coalition Pct",
-            "type": "numeric",
-            "format": dash_table.FormatTemplate.percentage(2),
-        },
-        {
-            "name": "Power",
-            "id": "Power",
-            "type": "numeric",
-            "format": dash_table.FormatTemplate.percentage(2),
-        },
-    ],
+    columns=simulation_election_columns,
     page_size=10,
     style_as_list_view=True,
     sort_action="native",
@@ -121,7 +125,7 @@ election_sim_tab = dbc.Tab(
                                                                                 This is a simulation of Trump's winning chances based on different hypothetical scenarios of states won.\
                                                                                 Users can select different states to assign to Trump, the Opposition candidate, or random chance between the two.
                                                                                 
-                                                                                1. Select number of trials to be run (Dropdown Below)
+                                                                                1. Select number of trials to be run, or the 'Exact' engine to solve the odds without sampling (Dropdowns Below)
                                                                                 2. In the 'Scenario' column of the below table, select the dropdown on a state if you wish to guarantee a win
                                                                                 3. Click 'Run Simulation'
                                                                             """
@@ -173,6 +177,14 @@ election_sim_tab = dbc.Tab(
                                                                     "label": "100,000",
                                                                     "value": "100000",
                                                                 },
+                                                                {
+                                                                    "label": "1,000,000",
+                                                                    "value": "1000000",
+                                                                },
+                                                                {
+                                                                    "label": "10,000,000",
+                                                                    "value": "10000000",
+                                                                },
                                                             ],
                                                             placeholder="Select Number of Trials",
                                                             value=10000,
@@ -180,6 +192,26 @@ election_sim_tab = dbc.Tab(
                                                         )
                                                     ]
                                                 ),
+                                                dbc.Col(
+                                                    [
+                                                        dcc.Dropdown(
+                                                            id="engine-election",
+                                                            options=[
+                                                                {
+                                                                    "label": "Monte Carlo",
+                                                                    "value": "monte-carlo",
+                                                                },
+                                                                {
+                                                                    "label": "Exact",
+                                                                    "value": "exact",
+                                                                },
+                                                            ],
+                                                            placeholder="Select Engine",
+                                                            value="monte-carlo",
+                                                            clearable=False,
+                                                        )
+                                                    ]
+                                                ),
                                                 dbc.Col(
                                                     [
                                                         html.Button(
@@ -198,7 +230,14 @@ election_sim_tab = dbc.Tab(
                                             [
                                                 dbc.Col(
                                                     [
-                                                        html.Div(state_input_table),
+                                                        dcc.Loading(
+                                                            children=[
+                                                                html.Div(
+                                                                    state_input_table
+                                                                )
+                                                            ],
+                                                            type="circle",
+                                                        ),
                                                     ],
                                                     sm=12,
                                                     xxl=6,
@@ -308,4 +347,5 @@ election_sim_tab = dbc.Tab(
         ),
     ],
     label="Election Simulation",
+    tab_id="election-sim-tab",
 )
@@ -1,20 +1,26 @@
 import dash_bootstrap_components as dbc
 from dash import dcc, html
 
+from dashboard.elections.constants import store_poll_seconds
 from dashboard.elections.layouts.election_sim_layout import election_sim_tab
 from dashboard.elections.layouts.political_power_layout import political_power_tab
 from dashboard.elections.layouts.polling_tab_layout import polling_tab
 
-election_dashboard_layout = dcc.Loading(
-    html.Div(
-        [
-            dcc.Store(id="national-average-store"),
-            dcc.Store(id="national-favorability-store"),
-            dcc.Store(id="state-polls-store"),
-            html.H2(
-                "2024 Presidential Election",
-            ),
-            dbc.Tabs([polling_tab, political_power_tab, election_sim_tab]),
-        ]
-    )
+# Each tab shows its own loading spinners, so one tab's work never blanks the whole page
+election_dashboard_layout = html.Div(
+    [
+        dcc.Store(id="national-average-store"),
+        dcc.Store(id="national-favorability-store"),
+        dcc.Store(id="state-polls-store"),
+        # Fires once on load, then polls until every store is filled
+        dcc.Interval(id="interval-component", interval=store_poll_seconds * 1000),
+        html.H2(
+            "2024 Presidential Election",
+        ),
+        dbc.Tabs(
+            [polling_tab, political_power_tab, election_sim_tab],
+            id="election-tabs",
+            active_tab="polling-tab",
+        ),
+    ]
 )
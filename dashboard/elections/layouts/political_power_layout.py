@@ -1,25 +1,29 @@
 import dash_bootstrap_components as dbc
 from dash import html, dash_table, dcc
 
+# Every column a simulation result can have; the callback shows the ones its engine produced, since
+# exact results have no coalition count
+simulation_power_columns = [
+    {"name": "State", "id": "State"},
+    {"name": "Delegates", "id": "Delegates"},
+    {"name": "Winning Coalition Count", "id": "Winning Coalition Count"},
+    {
+        "name": "Winning Coalition Pct",
+        "id": "Winning Coalition Pct",
+        "type": "numeric",
+        "format": dash_table.FormatTemplate.percentage(2),
+    },
+    {
+        "name": "Power",
+        "id": "Power",
+        "type": "numeric",
+        "format": dash_table.FormatTemplate.percentage(2),
+    },
+]
+
 simulation_power_table = dash_table.DataTable(
     id="simulation-power-table",
-    columns=[
-        {"name": "State", "id": "State"},
-        {"name": "Delegates", "id": "Delegates"},
-        {"name": "Winning Coalition Count", "id": "Winning Coalition Count"},
-        {
-            "name": "Winning Coalition Pct",
-            "id": "Winning Coalition Pct",
-            "type": "numeric",
-            "format": dash_table.FormatTemplate.percentage(2),
-        },
-        {
-            "name": "Power",
-            "id": "Power",
-            "type": "numeric",
-            "format": dash_table.FormatTemplate.percentage(2),
-        },
-    ],
+    columns=simulation_power_columns,
     page_size=10,
     style_as_list_view=True,
     sort_action="native",
@@ -215,6 +219,14 @@ political_power_tab = dbc.Tab(
                                                                         "label": "100,000",
                                                                         "value": "100000",
                                                                     },
+                                                                    {
+                                                                        "label": "1,000,000",
+                                                                        "value": "1000000",
+                                                                    },
+                                                                    {
+                                                                        "label": "10,000,000",
+                                                                        "value": "10000000",
+                                                                    },
                                                                 ],
                                                                 placeholder="Select Number of Trials",
                                                                 value=10000,
@@ -222,6 +234,26 @@ political_power_tab = dbc.Tab(
                                                             )
                                                         ]
                                                     ),
+                                                    dbc.Col(
+                                                        [
+                                                            dcc.Dropdown(
+                                                                id="engine-political-power",
+                                                                options=[
+                                                                    {
+                                                                        "label": "Monte Carlo",
+                                                                        "value": "monte-carlo",
+                                                                    },
+                                                                    {
+                                                                        "label": "Exact",
+                                                                        "value": "exact",
+                                                                    },
+                                                                ],
+                                                                placeholder="Select Engine",
+                                                                value="exact",
+                                                                clearable=False,
+                                                            )
+                                                        ]
+                                                    ),
                                                     dbc.Col(
                                                         [
                                                             html.Button(
@@ -291,4 +323,5 @@ political_power_tab = dbc.Tab(
         )
     ],
     label="Political Power Simulation",
+    tab_id="political-power-tab",
 )
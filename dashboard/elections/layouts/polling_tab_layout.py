@@ -20,6 +20,26 @@ candidate_dropdown = dcc.Dropdown(
     multi=False,
 )
 
+rolling_dropdown = dcc.Dropdown(
+    id="rolling-select",
+    options=[
+        {"label": "Last 5 days polled", "value": "5"},
+        {"label": "7 days", "value": "7D"},
+        {"label": "14 days", "value": "14D"},
+        {
+            "label": "14 days (favorability weighted by sample size)",
+            "value": "14D-weighted",
+        },
+        {
+            "label": "7 day half-life (favorability weighted by sample size)",
+            "value": "7D-halflife",
+        },
+    ],
+    value="5",
+    clearable=False,
+    multi=False,
+)
+
 state_dropdown = dcc.Dropdown(
     id="state-select",
     value="IA",
@@ -70,6 +90,13 @@ polling_tab = dbc.Tab(
             ],
             style={"padding-top": "10px"},
         ),
+        dbc.Row(
+            [
+                dbc.Col(html.P("Rolling Avg.:"), sm=1, xxl=1),
+                dbc.Col(rolling_dropdown, sm=11, xxl=3),
+            ],
+            style={"padding-top": "10px"},
+        ),
         dbc.Row(
             [
                 dbc.Col(
@@ -271,4 +298,5 @@ polling_tab = dbc.Tab(
         ),
     ],
     label="Current Polling",
+    tab_id="polling-tab",
 )
@@ -0,0 +1,215 @@
+from math import factorial
+from typing import Any, Dict, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+# Coalition counts stay below 2**n_players, so int64 is exact up to this many players; beyond it
+# the counts are held as Python integers
+int64_max_players = 62
+
+
+def _count_dtype(n_players: int) -> Any:
+    return np.int64 if n_players <= int64_max_players else object
+
+
+def _validate(weights: Sequence[int], quotas: Sequence[int]) -> npt.NDArray[np.int64]:
+    weight_array = np.asarray(weights, dtype=np.int64)
+    if weight_array.ndim != 1 or not len(weight_array):
+        raise ValueError("weights must be a non-empty list of integers")
+    if (weight_array <= 0).any():
+        raise ValueError("weights must be positive")
+    if not len(quotas) or not all(
+        0 < quota <= int(weight_array.sum()) for quota in quotas
+    ):
+        raise ValueError("quotas must be between 1 and the total weight")
+
+    return weight_array
+
+
+def coalition_counts(weights: Sequence[int], quota: int) -> npt.NDArray[Any]:
+    """
+    This function counts the coalitions of every total weight below the quota
+
+    The counts are the coefficients of the generating polynomial prod(1 + x**w), built with one
+    shifted add per player.
+
+    inputs:
+        weights - list(int): Each player's weight
+        quota - int: Weight required to win
+
+    returns:
+        counts - ndarray(int): Number of coalitions with each total weight from 0 to quota - 1
+    """
+    weight_array = _validate(weights, [quota])
+
+    counts = np.zeros(quota, dtype=_count_dtype(len(weight_array)))
+    counts[0] = 1
+    for w in weight_array[weight_array < quota]:
+        counts[w:] = counts[w:] + counts[: quota - w]
+
+    return counts
+
+
+def remove_player(counts: npt.NDArray[Any], weight: int) -> npt.NDArray[Any]:
+    """
+    This function removes one player from coalition counts by deconvolving its (1 + x**weight) factor
+
+    Without the player, counts[s] = without[s] + without[s - weight]. Along each stride of the weight
+    that recursion is an alternating running sum, so it is solved for all totals at once.
+
+    inputs:
+        counts - ndarray(int): Coalition counts by total weight, including the player
+        weight - int: The player's weight
+
+    returns:
+        without - ndarray(int): Coalition counts by total weight of the other players
+    """
+    length = len(counts)
+    rows = -(-length // weight)
+
+    strides = np.zeros(rows * weight, dtype=counts.dtype)
+    strides[:length] = counts
+    strides = strides.reshape(rows, weight)
+
+    signs = np.where(np.arange(rows) % 2 == 0, 1, -1).astype(np.int64)[:, np.newaxis]
+    without: npt.NDArray[Any] = (
+        signs * np.cumsum(signs * strides, axis=0).astype(counts.dtype)
+    ).reshape(-1)[:length]
+
+    return without
+
+
+def banzhaf_sweep_counts(
+    weights: Sequence[int], quotas: Sequence[int]
+) -> npt.NDArray[np.object_]:
+    """
+    This function counts the coalitions in which each player is critical (its Banzhaf score) for every quota
+
+    A player is critical when the others in the coalition weigh at least quota - weight but less than
+    the quota. The coalition counts are built once up to the largest quota and each distinct weight
+    is deconvolved once; a running sum of its counts then gives the scores for every quota as a
+    difference of two entries.
+
+    inputs:
+        weights - list(int): Each player's weight
+        quotas - list(int): Weights required to win
+
+    returns:
+        scores - ndarray(object): Banzhaf scores by (player, quota) as exact Python integers
+    """
+    weight_array = _validate(weights, quotas)
+    quota_array = np.asarray(quotas, dtype=np.int64)
+    counts = coalition_counts(weights, int(quota_array.max()))
+
+    scores: Dict[int, npt.NDArray[np.object_]] = {}
+    for weight in map(int, np.unique(weight_array)):
+        without = remove_player(counts, weight)
+        totals = np.zeros(len(without) + 1, dtype=without.dtype)
+        totals[1:] = np.cumsum(without)
+        scores[weight] = (
+            totals[quota_array] - totals[np.maximum(quota_array - weight, 0)]
+        ).astype(object)
+
+    return np.array([scores[int(w)] for w in weight_array], dtype=object)
+
+
+def banzhaf_sweep(
+    weights: Sequence[int], quotas: Sequence[int]
+) -> npt.NDArray[np.float64]:
+    """
+    This function calculates each player's normalized Banzhaf power index for every quota
+
+    inputs:
+        weights - list(int): Each player's weight
+        quotas - list(int): Weights required to win
+
+    returns:
+        power - ndarray(float): Each player's share of all critical memberships by (player, quota)
+    """
+    scores = banzhaf_sweep_counts(weights, quotas)
+    totals = scores.sum(axis=0).astype(np.float64)
+    power: npt.NDArray[np.float64] = (scores / totals).astype(np.float64)
+
+    return power
+
+
+def banzhaf_counts(weights: Sequence[int], quota: int) -> npt.NDArray[np.object_]:
+    """
+    This function counts the coalitions in which each player is critical (its Banzhaf score)
+
+    inputs:
+        weights - list(int): Each player's weight
+        quota - int: Weight required to win
+
+    returns:
+        scores - ndarray(object): Each player's Banzhaf score as an exact Python integer
+    """
+    scores: npt.NDArray[np.object_] = banzhaf_sweep_counts(weights, [quota])[:, 0]
+
+    return scores
+
+
+def banzhaf_index(weights: Sequence[int], quota: int) -> npt.NDArray[np.float64]:
+    """
+    This function calculates each player's normalized Banzhaf power index
+
+    inputs:
+        weights - list(int): Each player's weight
+        quota - int: Weight required to win
+
+    returns:
+        power - ndarray(float): Each player's share of all critical memberships
+    """
+    power: npt.NDArray[np.float64] = banzhaf_sweep(weights, [quota])[:, 0]
+
+    return power
+
+
+def shapley_shubik_index(weights: Sequence[int], quota: int) -> npt.NDArray[np.float64]:
+    """
+    This function calculates each player's Shapley-Shubik power index
+
+    A player is pivotal in an ordering when the players before it weigh less than the quota but reach
+    it with its weight. Coalitions are counted by (size, total weight) with one shifted add per
+    player, each player is removed by deconvolving along the (size, weight) diagonal, and the pivotal
+    counts of each size are weighted by size! * (n - 1 - size)! / n! in exact integers.
+
+    inputs:
+        weights - list(int): Each player's weight
+        quota - int: Weight required to win
+
+    returns:
+        power - ndarray(float): Each player's share of the orderings in which it is pivotal
+    """
+    weight_array = _validate(weights, [quota])
+    n_players = len(weight_array)
+
+    # counts[k, s]: coalitions of k players with total weight s, for s below the quota
+    counts = np.zeros((n_players + 1, quota), dtype=_count_dtype(n_players))
+    counts[0, 0] = 1
+    for w in weight_array[weight_array < quota]:
+        counts[1:, w:] = counts[1:, w:] + counts[:-1, : quota - w]
+
+    orderings = [
+        factorial(size) * factorial(n_players - 1 - size) for size in range(n_players)
+    ]
+    total_orderings = factorial(n_players)
+
+    power: Dict[int, float] = {}
+    for weight in map(int, np.unique(weight_array)):
+        first = max(quota - weight, 0)
+
+        # Without the player, counts[k, s] = without[k, s] + without[k - 1, s - weight]
+        without = counts[0].copy()
+        pivotal = orderings[0] * int(without[first:].sum())
+        for size in range(1, n_players):
+            previous = without
+            without = counts[size].copy()
+            if weight < quota:
+                without[weight:] -= previous[: quota - weight]
+            pivotal += orderings[size] * int(without[first:].sum())
+
+        power[weight] = pivotal / total_orderings
+
+    return np.array([power[int(w)] for w in weight_array], dtype=np.float64)
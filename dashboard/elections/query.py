@@ -1,27 +1,153 @@
-from typing import Tuple
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
 
 import pandas as pd
 
+from dashboard.elections import fetch
+from dashboard.elections.singleflight import SingleFlight
 from dashboard.elections.constants import (
     import_columns,
     candidate_names,
     state_code_mapping,
+    national_avg_poll_url,
+    national_favorability_url,
+    state_polls_url,
 )
 
+# Concurrent loads of the same dataset share one download and parse
+loader_flights = SingleFlight()
 
-def get_national_avg_polling_data() -> pd.DataFrame:
+
+@dataclass(frozen=True)
+class CsvProfile:
+    """
+    Describes which columns of a polling CSV to parse and how to type them on load
+
+    attributes:
+        columns - tuple(str): Columns to read; every other column is skipped by the parser
+        dtypes - dict: Declared dtype for each column (categoricals for repeated labels)
+        dates - tuple(str): Columns parsed as dates while reading
+        date_format - str: strftime format of the date columns, or None to infer it
+    """
+
+    columns: Tuple[str, ...]
+    dtypes: Dict[str, str] = field(default_factory=dict)
+    dates: Tuple[str, ...] = ()
+    date_format: Optional[str] = None
+
+
+national_avg_profile = CsvProfile(
+    columns=(*import_columns, "party"),
+    dtypes={
+        "candidate": "category",
+        "state": "category",
+        "party": "category",
+        "pct_estimate": "float64",
+        "pct_trend_adjusted": "float64",
+        "cycle": "int16",
+    },
+    dates=("date",),
+)
+
+national_favorability_profile = CsvProfile(
+    columns=(
+        "poll_id",
+        "politician",
+        "favorable",
+        "unfavorable",
+        "very_favorable",
+        "somewhat_favorable",
+        "somewhat_unfavorable",
+        "very_unfavorable",
+        "sample_size",
+        "end_date",
+    ),
+    dtypes={
+        "politician": "category",
+        "favorable": "float64",
+        "unfavorable": "float64",
+        "very_favorable": "float64",
+        "somewhat_favorable": "float64",
+        "somewhat_unfavorable": "float64",
+        "very_unfavorable": "float64",
+        "sample_size": "float64",
+    },
+    dates=("end_date",),
+    date_format="%m/%d/%y",
+)
+
+state_polls_profile = CsvProfile(
+    columns=(
+        "poll_id",
+        "state",
+        "notes",
+        "party",
+        "candidate_name",
+        "pct",
+        "sample_size",
+        "end_date",
+    ),
+    dtypes={
+        "state": "category",
+        "notes": "category",
+        "party": "category",
+        "candidate_name": "category",
+        "pct": "float64",
+        "sample_size": "float64",
+    },
+    dates=("end_date",),
+    date_format="%m/%d/%y",
+)
+
+
+def read_polling_csv(path: Union[str, Path], profile: CsvProfile) -> pd.DataFrame:
+    """
+    This function parses a polling CSV with the C engine, reading only the profile's columns
+
+    inputs:
+        path - Path: Location of the CSV
+        profile - CsvProfile: Columns, dtypes and date columns to use
+
+    returns:
+        df - dataframe: The projected and typed CSV contents
+    """
+    df = pd.read_csv(
+        path,
+        engine="c",
+        usecols=lambda column: column in profile.columns,
+        dtype=profile.dtypes,
+        parse_dates=list(profile.dates),
+        date_format=profile.date_format,
+    )
+
+    # The parser leaves a column as text if it doesn't match the declared format
+    for column in profile.dates:
+        if not pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = pd.to_datetime(df[column], format="mixed")
+
+    return df
+
+
+@loader_flights.wrap
+def get_national_avg_polling_data(
+    url: str = national_avg_poll_url, timeout: float = 30
+) -> pd.DataFrame:
     """
     This function imports national average polling data from FiveThirtyEight, converts to a Panda's dataframe and clean/scrubs data
 
+    inputs:
+        url - str: Location of the CSV (defaults to FiveThirtyEight)
+        timeout - float: Seconds to wait on the server before using the cached copy
+
     returns:
         national_avg_poll_df | Panda's Dataframe : A Panda's dataframe of national polling averages
 
 
     """
     # Import csv as dataframe
-    national_avg_poll_df = pd.read_csv(
-        "https://projects.fivethirtyeight.com/polls/data/presidential_primary_averages.csv",
-        engine="python",
+    national_avg_poll_df = read_polling_csv(
+        fetch.fetch_csv(url, timeout=timeout), national_avg_profile
     )
 
     # Remove prior election cycle data and take only columns we need
@@ -49,14 +175,24 @@ def get_national_avg_polling_data() -> pd.DataFrame:
     national_avg_poll_df = national_avg_poll_df[
         national_avg_poll_df["Candidate"].isin(["Haley", "Trump"])
     ]
+    national_avg_poll_df["Candidate"] = national_avg_poll_df[
+        "Candidate"
+    ].cat.remove_unused_categories()
 
     return national_avg_poll_df
 
 
-def get_national_favorability_polling_data() -> pd.DataFrame:
+@loader_flights.wrap
+def get_national_favorability_polling_data(
+    url: str = national_favorability_url, timeout: float = 30
+) -> pd.DataFrame:
     """
     This function imports national favorability polling data from FiveThirtyEight, converts to a Panda's dataframe and clean/scrubs data
 
+    inputs:
+        url - str: Location of the CSV (defaults to FiveThirtyEight)
+        timeout - float: Seconds to wait on the server before using the cached copy
+
     returns:
         national_favorability_df | Panda's Dataframe : A Panda's dataframe of national polling averages
 
@@ -64,9 +200,8 @@ def get_national_favorability_polling_data() -> pd.DataFrame:
     """
 
     # Import csv as dataframe
-    national_favorability_df = pd.read_csv(
-        "https://projects.fivethirtyeight.com/polls-page/data/favorability_polls.csv",
-        engine="python",
+    national_favorability_df = read_polling_csv(
+        fetch.fetch_csv(url, timeout=timeout), national_favorability_profile
     )
 
     # Rename columns
@@ -91,14 +226,24 @@ def get_national_favorability_polling_data() -> pd.DataFrame:
     national_favorability_df = national_favorability_df[
         national_favorability_df["Candidate"].isin(["Haley", "Trump"])
     ]
+    national_favorability_df["Candidate"] = national_favorability_df[
+        "Candidate"
+    ].cat.remove_unused_categories()
 
     return national_favorability_df
 
 
-def get_state_polling_data() -> pd.DataFrame:
+@loader_flights.wrap
+def get_state_polling_data(
+    url: str = state_polls_url, timeout: float = 30
+) -> pd.DataFrame:
     """
     This function imports state polling data from FiveThirtyEight, converts to a Panda's dataframe and clean/scrubs data
 
+    inputs:
+        url - str: Location of the CSV (defaults to FiveThirtyEight)
+        timeout - float: Seconds to wait on the server before using the cached copy
+
     returns:
         state_polls_df | Panda's Dataframe : A Panda's dataframe of national polling averages
 
@@ -106,9 +251,8 @@ def get_state_polling_data() -> pd.DataFrame:
     """
 
     # Import csv as dataframe
-    state_polls_df = pd.read_csv(
-        "https://projects.fivethirtyeight.com/polls-page/data/president_primary_polls.csv",
-        engine="python",
+    state_polls_df = read_polling_csv(
+        fetch.fetch_csv(url, timeout=timeout), state_polls_profile
     )
 
     # Rename columns
@@ -132,5 +276,8 @@ def get_state_polling_data() -> pd.DataFrame:
     state_polls_df = state_polls_df[
         state_polls_df["Candidate"].isin(["Haley", "Trump"])
     ]
+    state_polls_df["Candidate"] = state_polls_df[
+        "Candidate"
+    ].cat.remove_unused_categories()
 
     return state_polls_df
@@ -0,0 +1,172 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class RollingSpec:
+    """
+    How a rolling average is computed
+
+    attributes:
+        window - int or str: Rows per window, or a calendar period such as "7D" (ignored when halflife is set)
+        halflife - str: Half-life of an exponentially decaying average, such as "7D"
+        weight - str: Column weighting each row, such as "sample_size" (rows are weighted equally when
+            None or when the dataset has no such column)
+        min_periods - int: Rows with a value a window needs before it produces an average (defaults
+            to the window for row windows and 1 otherwise)
+    """
+
+    window: Union[int, str] = 5
+    halflife: Optional[str] = None
+    weight: Optional[str] = None
+    min_periods: Optional[int] = None
+
+    @property
+    def calendar(self) -> bool:
+        """
+        This function reports whether windows are measured in time rather than rows
+
+        returns:
+            calendar - bool: True for calendar windows and exponential decay
+        """
+        return self.halflife is not None or isinstance(self.window, str)
+
+
+# The trend charts' original 5 row rolling average
+default_spec = RollingSpec()
+
+# Rolling averages offered on the 'Current Polling' tab, keyed by dropdown value; sample size weights
+# only apply to the favorability trend, since the national voting averages have no sample sizes
+rolling_specs: Dict[str, RollingSpec] = {
+    "5": default_spec,
+    "7D": RollingSpec(window="7D"),
+    "14D": RollingSpec(window="14D"),
+    "14D-weighted": RollingSpec(window="14D", weight="sample_size"),
+    "7D-halflife": RollingSpec(halflife="7D", weight="sample_size"),
+}
+
+
+def rolling_mean(
+    df: pd.DataFrame,
+    column: str,
+    spec: RollingSpec,
+    by: str = "Candidate",
+    on: str = "Date",
+) -> pd.Series:
+    """
+    This function computes a rolling average of a column for every group in one vectorized pass
+
+    Weighted sums and weights are rolled together and divided, so weighting costs no extra pass.
+    With calendar windows every row on a date gets the average of the window ending that date.
+
+    inputs:
+        df - dataframe: Rows ordered by group and then date
+        column - str: The column to average
+        spec - RollingSpec: The window, decay and weighting
+        by - str: The column identifying each group
+        on - str: The date column
+
+    returns:
+        rolling - Series: The rolling average of each row, aligned with df
+    """
+    values = df[column].to_numpy(dtype=np.float64)
+    if spec.weight is not None and spec.weight in df.columns:
+        weights = df[spec.weight].to_numpy(dtype=np.float64)
+    else:
+        weights = np.ones(len(df))
+
+    observed = ~np.isnan(values) & ~np.isnan(weights) & (weights > 0)
+    weighted = np.where(observed, values * weights, 0.0)
+    weights = np.where(observed, weights, 0.0)
+
+    groups = pd.factorize(df[by])[0]
+    dates = df[on].to_numpy(dtype="datetime64[ns]")
+
+    if spec.halflife is not None:
+        # Both terms share the decay's normalisation, so their ratio is the weighted average
+        frame = pd.DataFrame({"weighted": weighted, "weight": weights})
+        sums = (
+            frame.groupby(groups, sort=False)
+            .ewm(halflife=spec.halflife, times=dates)
+            .mean()
+            .droplevel(0)
+            .sort_index()
+        )
+        weighted_sum = sums["weighted"].to_numpy()
+        weight_sum = sums["weight"].to_numpy()
+        counts = pd.Series(observed).groupby(groups, sort=False).cumsum().to_numpy()
+    else:
+        # Window sums are differences of running totals, with each window's first row found by
+        # position (row windows) or by binary search on (group, date) (calendar windows)
+        start = window_starts(groups, dates, spec.window)
+        end = np.arange(1, len(df) + 1)
+
+        def window_sum(x: npt.NDArray[Any]) -> npt.NDArray[np.float64]:
+            totals = np.zeros(len(x) + 1)
+            totals[1:] = np.cumsum(x, dtype=np.float64)
+            sums: npt.NDArray[np.float64] = totals[end] - totals[start]
+            return sums
+
+        weighted_sum = window_sum(weighted)
+        weight_sum = window_sum(weights)
+        counts = window_sum(observed)
+
+    min_periods = spec.min_periods
+    if min_periods is None:
+        min_periods = 1 if spec.calendar else int(spec.window)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(
+            (counts >= min_periods) & (weight_sum > 0),
+            weighted_sum / weight_sum,
+            np.nan,
+        )
+
+    if spec.calendar:
+        # Rows sharing a date take the value of the last one, whose window covers them all
+        last = np.append((groups[1:] != groups[:-1]) | (dates[1:] != dates[:-1]), True)
+        block = np.cumsum(np.append(True, last[:-1])) - 1
+        mean = mean[np.flatnonzero(last)][block]
+
+    return pd.Series(mean, index=df.index, name=column)
+
+
+def window_starts(
+    groups: npt.NDArray[np.intp],
+    dates: npt.NDArray[np.datetime64],
+    window: Union[int, str],
+) -> npt.NDArray[np.intp]:
+    """
+    This function finds the first row of the window ending at each row
+
+    inputs:
+        groups - array: Each row's group number, in ascending order
+        dates - array: Each row's date, in ascending order within its group
+        window - int or str: Rows per window, or a fixed calendar period such as "7D"
+
+    returns:
+        starts - array: Position of each window's first row
+    """
+    n_rows = len(groups)
+    group_begins = np.flatnonzero(np.append(True, groups[1:] != groups[:-1]))
+    group_start = np.repeat(group_begins, np.diff(np.append(group_begins, n_rows)))
+
+    if not isinstance(window, str):
+        starts: npt.NDArray[np.intp] = np.maximum(
+            np.arange(n_rows) - int(window) + 1, group_start
+        )
+        return starts
+
+    # Windows cover (date - window, date]; offsetting each group past the previous one's dates
+    # turns (group, date) into a single sorted key
+    seconds = dates.astype("datetime64[s]").astype(np.int64)
+    seconds = seconds - (seconds.min() if n_rows else 0)
+    period = int(pd.Timedelta(window).total_seconds())
+    span = (int(seconds.max()) if n_rows else 0) + period + 1
+    keys = groups.astype(np.int64) * span + seconds
+
+    return np.searchsorted(keys, keys - period, side="right")
@@ -0,0 +1,334 @@
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing import get_context
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+import numpy as np
+import numpy.typing as npt
+
+from dashboard.elections.constants import delegate_threshold, states
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Trials are drawn in chunks of this size so memory stays bounded for large runs
+trial_chunk_size = 50_000
+
+# Runs at least this large are spread across a process pool by default
+parallel_trial_threshold = 1_000_000
+
+# Workers in the shared process pool; every server process gets its own pool, so set this to the
+# cores per server process (e.g. cores / gunicorn workers) to avoid oversubscribing the machine
+pool_workers = max(
+    int(os.environ.get("SIMULATION_POOL_WORKERS", os.cpu_count() or 1)), 1
+)
+
+
+@dataclass(frozen=True)
+class DelegateModel:
+    """
+    Immutable description of the primary calendar shared by every simulation request
+
+    attributes:
+        state_codes - tuple(str): State codes in the order they vote
+        delegates - ndarray(int): Read-only delegates for each state in the same order
+    """
+
+    state_codes: Tuple[str, ...]
+    delegates: npt.NDArray[np.int32]
+
+
+def delegate_model(states_dict: Mapping[str, Mapping[str, int]]) -> DelegateModel:
+    """
+    This function snapshots an ordered mapping of states into an immutable delegate model
+
+    inputs:
+        states_dict - dict: An ordered mapping of state code to a dictionary holding its "Delegates"
+
+    returns:
+        model - DelegateModel: The state order and a read-only delegate vector
+    """
+    delegates = np.array(
+        [states_dict[state]["Delegates"] for state in states_dict], dtype=np.int32
+    )
+    delegates.flags.writeable = False
+
+    return DelegateModel(tuple(states_dict), delegates)
+
+
+# Built once at import; simulations only ever read from it
+primary_model = delegate_model(states)
+
+
+def coalition_counts(
+    outcomes: npt.NDArray[np.bool_], delegates: npt.NDArray[np.int32]
+) -> Tuple[npt.NDArray[np.int64], int]:
+    """
+    This function tallies how often each state belongs to the winning coalition for a batch of trials
+
+    inputs:
+        outcomes - ndarray(bool): A (trials x states) matrix that is True where Trump wins the state
+        delegates - ndarray(int): Delegates for each state in the order they vote
+
+    returns:
+        counts - ndarray(int): Number of trials in which each state was part of Trump's winning coalition
+        wins - int: Number of trials won by Trump
+    """
+    n_states = delegates.shape[0]
+
+    # Running delegate totals for each side after every state has voted
+    red_sum = np.cumsum(np.where(outcomes, delegates, 0), axis=1, dtype=np.int32)
+    blue_sum = np.cumsum(np.where(outcomes, 0, delegates), axis=1, dtype=np.int32)
+
+    # The race stops at the first state that pushes either side over the threshold
+    decided = (red_sum >= delegate_threshold) | (blue_sum >= delegate_threshold)
+    stop = np.where(decided.any(axis=1), decided.argmax(axis=1), n_states - 1)
+
+    red_won = red_sum[np.arange(outcomes.shape[0]), stop] >= delegate_threshold
+
+    # States voting after the race is decided never join the coalition
+    in_play = np.arange(n_states) <= stop[:, np.newaxis]
+    coalition = outcomes & in_play & red_won[:, np.newaxis]
+
+    return coalition.sum(axis=0, dtype=np.int64), int(red_won.sum())
+
+
+def scenario_masks(
+    state_codes: Tuple[str, ...], hypo_dict: Dict[str, Any]
+) -> Tuple[npt.NDArray[np.bool_], npt.NDArray[np.bool_]]:
+    """
+    This function converts the 'Scenario' column of the state input table into forced outcome masks
+
+    inputs:
+        state_codes - tuple(str): State codes in the order they vote
+        hypo_dict - dict: A dictionary of state code to scenario ("Trump", "Opposition" or None)
+
+    returns:
+        forced_trump - ndarray(bool): True for states Trump is guaranteed to win
+        forced_opposition - ndarray(bool): True for states the opposition is guaranteed to win
+    """
+    scenarios = np.array([hypo_dict.get(state) for state in state_codes], dtype=object)
+
+    return scenarios == "Trump", scenarios == "Opposition"
+
+
+def simulate_chunk(
+    n_trials: int,
+    seed_sequence: np.random.SeedSequence,
+    delegates: npt.NDArray[np.int32],
+    forced_trump: Optional[npt.NDArray[np.bool_]] = None,
+    forced_opposition: Optional[npt.NDArray[np.bool_]] = None,
+) -> Tuple[npt.NDArray[np.int64], int]:
+    """
+    This function simulates a single chunk of trials from its own seed stream
+
+    inputs:
+        n_trials - int: Number of trials in the chunk
+        seed_sequence - SeedSequence: Independent seed stream for this chunk
+        delegates - ndarray(int): Delegates for each state in the order they vote
+        forced_trump - ndarray(bool): Optional mask of states Trump is guaranteed to win
+        forced_opposition - ndarray(bool): Optional mask of states the opposition is guaranteed to win
+
+    returns:
+        counts - ndarray(int): Number of trials in which each state was part of Trump's winning coalition
+        wins - int: Number of trials won by Trump
+    """
+    rng = np.random.default_rng(seed_sequence)
+
+    outcomes = rng.integers(0, 2, size=(n_trials, delegates.shape[0]), dtype=bool)
+    if forced_trump is not None:
+        outcomes |= forced_trump
+    if forced_opposition is not None:
+        outcomes &= ~forced_opposition
+
+    return coalition_counts(outcomes, delegates)
+
+
+def process_pool() -> ProcessPoolExecutor:
+    """
+    This function returns the process pool shared by parallel simulations, creating it on first use
+
+    returns:
+        pool - ProcessPoolExecutor: A pool with pool_workers workers
+    """
+    global _process_pool
+
+    with _process_pool_lock:
+        if _process_pool is None:
+            # Spawn rather than fork so workers never inherit the web server's threads
+            _process_pool = ProcessPoolExecutor(
+                max_workers=pool_workers, mp_context=get_context("spawn")
+            )
+
+    return _process_pool
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def pool_map(function: Callable[..., T], *iterables: Iterable[Any]) -> List[T]:
+    """
+    This function maps a function across the shared process pool, running it in this process if the pool is broken
+
+    A worker that dies (e.g. killed for memory) breaks the whole pool, so the broken pool is
+    replaced for the next call and this call's work is redone in-process.
+
+    inputs:
+        function - callable: A picklable module-level function
+        iterables - iterables: The arguments of each call, as for map
+
+    returns:
+        results - list: The result of each call in order
+    """
+    global _process_pool
+
+    arguments = list(zip(*iterables))
+    pool = process_pool()
+    try:
+        return list(pool.map(function, *zip(*arguments)))
+    except BrokenProcessPool:
+        logger.exception("Process pool broke, running %s in-process", function.__name__)
+
+        with _process_pool_lock:
+            if _process_pool is pool:
+                _process_pool = None
+        pool.shutdown(wait=False)
+
+        return [function(*args) for args in arguments]
+
+
+def simulate_primary(
+    n_trials: int,
+    delegates: npt.NDArray[np.int32],
+    seed: Optional[int] = None,
+    forced_trump: Optional[npt.NDArray[np.bool_]] = None,
+    forced_opposition: Optional[npt.NDArray[np.bool_]] = None,
+    parallel: Optional[bool] = None,
+) -> Tuple[npt.NDArray[np.int64], int]:
+    """
+    This function runs a batched monte carlo simulation of the primary where every state is a coin flip
+    unless its outcome is forced by a scenario
+
+    Trials are split into fixed-size chunks and every chunk draws from its own seed stream spawned
+    from the root seed, so a seeded run returns the same counts whether the chunks run in this
+    process or across the process pool.
+
+    inputs:
+        n_trials - int: Number of trials to run in the simulation
+        delegates - ndarray(int): Delegates for each state in the order they vote
+        seed - int: Optional root seed for the random number generators
+        forced_trump - ndarray(bool): Optional mask of states Trump is guaranteed to win
+        forced_opposition - ndarray(bool): Optional mask of states the opposition is guaranteed to win
+        parallel - bool: Run the chunks across the process pool (defaults to large runs only)
+
+    returns:
+        counts - ndarray(int): Number of trials in which each state was part of Trump's winning coalition
+        wins - int: Number of trials won by Trump
+    """
+    chunk_sizes = [
+        min(trial_chunk_size, n_trials - start)
+        for start in range(0, n_trials, trial_chunk_size)
+    ]
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+
+    if parallel is None:
+        parallel = n_trials >= parallel_trial_threshold and pool_workers > 1
+
+    n_chunks = len(chunk_sizes)
+    if parallel and n_chunks > 1:
+        results = pool_map(
+            simulate_chunk,
+            chunk_sizes,
+            seed_sequences,
+            [delegates] * n_chunks,
+            [forced_trump] * n_chunks,
+            [forced_opposition] * n_chunks,
+        )
+    else:
+        results = [
+            simulate_chunk(
+                chunk, seed_sequence, delegates, forced_trump, forced_opposition
+            )
+            for chunk, seed_sequence in zip(chunk_sizes, seed_sequences)
+        ]
+
+    counts = np.zeros(delegates.shape[0], dtype=np.int64)
+    wins = 0
+    for chunk_counts, chunk_wins in results:
+        counts += chunk_counts
+        wins += chunk_wins
+
+    return counts, wins
+
+
+def exact_primary(
+    delegates: npt.NDArray[np.int32], trump_probability: npt.NDArray[np.float64]
+) -> Tuple[float, npt.NDArray[np.float64]]:
+    """
+    This function solves the sequential primary exactly with a dynamic program over (state, Trump's delegates)
+
+    States vote in order and the race stops as soon as either side reaches the threshold. A forward pass
+    gives the probability of each undecided delegate total before every state votes and a backward pass
+    gives the probability that Trump goes on to win from each of those totals.
+
+    inputs:
+        delegates - ndarray(int): Delegates for each state in the order they vote
+        trump_probability - ndarray(float): Probability Trump wins each state (1 or 0 for forced scenarios)
+
+    returns:
+        win_probability - float: Probability that Trump reaches the threshold first
+        membership - ndarray(float): Probability each state is part of Trump's winning coalition
+    """
+    n_states = delegates.shape[0]
+    red_sum = np.arange(delegate_threshold)
+    prior_delegates = np.cumsum(delegates) - delegates
+
+    # Forward pass: probability the race is still undecided with Trump on each total before state s
+    forward = np.zeros((n_states + 1, delegate_threshold))
+    forward[0, 0] = 1.0
+    for s in range(n_states):
+        p, d = trump_probability[s], int(delegates[s])
+        blue_sum = prior_delegates[s] - red_sum
+
+        forward[s + 1, d:] += p * forward[s, : delegate_threshold - d]
+        forward[s + 1] += np.where(
+            blue_sum + d < delegate_threshold, (1 - p) * forward[s], 0.0
+        )
+
+    # Backward pass: probability Trump wins from each undecided total before state s
+    backward = np.zeros((n_states + 1, delegate_threshold))
+    red_after_win = np.zeros((n_states, delegate_threshold))
+    for s in reversed(range(n_states)):
+        p, d = trump_probability[s], int(delegates[s])
+        blue_sum = prior_delegates[s] - red_sum
+        shifted = red_sum + d
+
+        red_after_win[s] = np.where(
+            shifted >= delegate_threshold,
+            1.0,
+            backward[s + 1, np.minimum(shifted, delegate_threshold - 1)],
+        )
+        red_after_loss = np.where(
+            blue_sum + d >= delegate_threshold, 0.0, backward[s + 1]
+        )
+        backward[s] = p * red_after_win[s] + (1 - p) * red_after_loss
+
+    membership = trump_probability * (forward[:n_states] * red_after_win).sum(axis=1)
+
+    return float(backward[0, 0]), membership
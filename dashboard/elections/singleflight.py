@@ -0,0 +1,107 @@
+import functools
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, ParamSpec, TypeVar, cast
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+class _Flight:
+    """
+    A single in-progress call whose outcome is shared with every waiter
+    """
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key so only one of them does the work
+
+    The first caller for a key runs the function; callers arriving while it is in flight wait for
+    it and receive the same result (or exception). Once it finishes the next call starts afresh.
+
+    attributes:
+        calls - int: Number of calls made through the group
+        coalesced - int: Number of calls that waited on another caller instead of running
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.coalesced = 0
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        This function runs fn unless a call with the same key is already in flight, in which case it waits for that call
+
+        inputs:
+            key - hashable: Identifies calls that can share a result
+            fn - callable: The work to run
+
+        returns:
+            result - any: The result of fn, from this call or the one it joined
+        """
+        with self._lock:
+            self.calls += 1
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                flight = self._flights[key] = _Flight()
+                leader = True
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return cast(T, flight.result)
+
+        try:
+            result = fn()
+            flight.result = result
+            return result
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        This function reports how many calls were made and how many were coalesced
+
+        returns:
+            stats - dict: Total calls, coalesced calls and calls currently in flight
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._flights),
+            }
+
+    def wrap(self, fn: Callable[P, T]) -> Callable[P, T]:
+        """
+        This function decorates fn so concurrent calls with the same arguments share one execution
+
+        inputs:
+            fn - callable: The function to coalesce
+
+        returns:
+            wrapper - callable: fn routed through this group
+        """
+
+        @functools.wraps(fn)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            key = (fn.__qualname__, args, tuple(sorted(kwargs.items())))
+            return self.do(key, lambda: fn(*args, **kwargs))
+
+        return wrapper
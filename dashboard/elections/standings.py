@@ -0,0 +1,79 @@
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import pandas as pd
+
+# Columns shown for each candidate's standing in a state
+standing_columns = ["Code", "Candidate", "Percentage", "Diff"]
+
+
+@dataclass(frozen=True)
+class StateStandings:
+    """
+    Each candidate's latest poll in every state, built once per version of the state polling data
+
+    attributes:
+        rows - dataframe: Code, Candidate, Percentage and Diff (lead over the next candidate), ordered
+            by state and then by Percentage from highest to lowest
+        bounds - dict: Each state code's (start, stop) row positions in rows
+        leaders - dataframe: The leading candidate's row for each state with polling, ordered by state code
+    """
+
+    rows: pd.DataFrame
+    bounds: Dict[str, Tuple[int, int]]
+    leaders: pd.DataFrame
+
+    def state(self, code: str) -> pd.DataFrame:
+        """
+        This function returns a state's standings without scanning the other states
+
+        inputs:
+            code - str: The state's two letter code
+
+        returns:
+            df - dataframe: The state's candidates from highest to lowest Percentage (empty if it has no polls)
+        """
+        start, stop = self.bounds.get(code, (0, 0))
+
+        return self.rows.iloc[start:stop]
+
+
+def state_standings(state_poll_df: pd.DataFrame) -> StateStandings:
+    """
+    This function builds the state standings index from the state polling data
+
+    inputs:
+        state_poll_df - dataframe: A dataframe of state polling data
+
+    returns:
+        standings - StateStandings: Each candidate's latest poll in every state
+    """
+    df = state_poll_df.loc[
+        (state_poll_df["notes"] != "head-to-head poll")
+        & state_poll_df["Code"].notna()
+        & state_poll_df["Candidate"].notna()
+        & state_poll_df["Date"].notna(),
+        standing_columns[:3] + ["Date"],
+    ]
+
+    # Latest poll of each candidate in each state (the first row on ties, like idxmax)
+    df = df.sort_values("Date", ascending=False, kind="stable").drop_duplicates(
+        ["Code", "Candidate"]
+    )
+
+    # Lead of each candidate over the next one down in the same state
+    df = df.sort_values(["Code", "Percentage"], kind="stable")
+    df["Diff"] = df.groupby("Code", observed=True)["Percentage"].diff()
+
+    rows = df.sort_values(
+        ["Code", "Percentage", "Diff"], ascending=[True, False, True], kind="stable"
+    )[standing_columns].reset_index(drop=True)
+
+    bounds = {
+        str(code): (int(positions[0]), int(positions[-1]) + 1)
+        for code, positions in rows.groupby("Code", observed=True).indices.items()
+    }
+
+    leaders = rows.groupby("Code", observed=True).first().reset_index()
+
+    return StateStandings(rows=rows, bounds=bounds, leaders=leaders)
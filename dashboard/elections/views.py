@@ -0,0 +1,933 @@
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from dashboard.elections import rolling
+from dashboard.elections.rolling import RollingSpec
+
+# Favorability columns averaged per candidate and day
+favorability_columns = ["Favorable", "Unfavorable"]
+
+# Favorability sums are kept in millionths so totals add up exactly in any order
+total_scale = 1_000_000
+
+
+@dataclass(frozen=True)
+class NationalAvgViews:
+    """
+    Views of the national polling averages, rebuilt when the dataset changes (it is small enough
+    that a rebuild is cheaper than finding the added rows)
+
+    attributes:
+        latest - dataframe: Each candidate's most recent row, ordered by candidate name
+        trend - CandidateSeries: Each candidate's Percentage and Rolling (the rolling average) by date
+        kpis - VotingKpis: Each candidate's position and vote % on every polling date
+    """
+
+    latest: pd.DataFrame
+    trend: "CandidateSeries"
+    kpis: "VotingKpis"
+
+
+@dataclass(frozen=True)
+class FavorabilityViews:
+    """
+    Views of the national favorability polls, maintained as the dataset is refreshed
+
+    attributes:
+        row_hashes - array: A hash of each source row, used to spot refreshes that only add rows
+        latest - dataframe: Each candidate's most recent poll, ordered by candidate name
+        sums - array: Each favorability column's sum in millionths for every row of trend
+        counts - array: Each favorability column's number of values for every row of trend
+        trend - CandidateSeries: Candidate, Date, the daily mean of each favorability column and its
+            rolling average, in the same candidate order as polls
+        polls - CandidateSeries: Each candidate's individual polls by date
+        kpis - FavorabilityKpis: Each candidate's latest poll and first poll since every date
+    """
+
+    row_hashes: npt.NDArray[np.uint64]
+    latest: pd.DataFrame
+    sums: npt.NDArray[np.int64]
+    counts: npt.NDArray[np.int64]
+    trend: "CandidateSeries"
+    polls: "CandidateSeries"
+    kpis: "FavorabilityKpis"
+
+
+@dataclass(frozen=True)
+class CandidateSeries:
+    """
+    A dataset's rows grouped by candidate with each candidate's rows ordered by date, so a candidate's
+    rows from a start date on are a binary search and a zero-copy slice away
+
+    attributes:
+        rows - dataframe: The rows, ordered by candidate and then date
+        bounds - dict: Each candidate's (start, stop) row positions in rows
+        dates - array: The Date column of rows, for binary searches
+    """
+
+    rows: pd.DataFrame
+    bounds: Dict[str, Tuple[int, int]]
+    dates: npt.NDArray[np.datetime64]
+
+    def since(self, candidate: str, start_date: Any) -> pd.DataFrame:
+        """
+        This function returns a candidate's rows on or after a date
+
+        inputs:
+            candidate - str: The candidate
+            start_date - date: The first date to include
+
+        returns:
+            df - dataframe: A slice of rows, ordered by date (empty if there are none)
+        """
+        start, stop = self.bounds.get(candidate, (0, 0))
+        first = start + int(
+            np.searchsorted(self.dates[start:stop], _day(start_date), side="left")
+        )
+
+        return self.rows.iloc[first:stop]
+
+
+def _day(value: Any) -> np.datetime64:
+    day: np.datetime64 = pd.Timestamp(value).to_datetime64()
+    return day
+
+
+def candidate_series(df: pd.DataFrame) -> CandidateSeries:
+    """
+    This function orders a dataset by candidate and date and indexes each candidate's rows
+
+    inputs:
+        df - dataframe: Rows with Candidate and Date columns
+
+    returns:
+        series - CandidateSeries: The indexed rows
+    """
+    rows = (
+        df[df["Candidate"].notna() & df["Date"].notna()]
+        .sort_values(["Candidate", "Date"], kind="stable")
+        .reset_index(drop=True)
+    )
+    dates = rows["Date"].to_numpy(dtype="datetime64[ns]")
+
+    return CandidateSeries(
+        rows=rows,
+        bounds={
+            str(candidate): (int(positions[0]), int(positions[-1]) + 1)
+            for candidate, positions in rows.groupby(
+                "Candidate", observed=True
+            ).indices.items()
+        },
+        dates=dates,
+    )
+
+
+def _ordered_series(rows: pd.DataFrame, lengths: Dict[str, int]) -> CandidateSeries:
+    # Rows already ordered by candidate and date, with each candidate's number of rows
+    stops = np.cumsum(list(lengths.values()), dtype=np.int64)
+
+    return CandidateSeries(
+        rows=rows,
+        bounds={
+            candidate: (int(stop) - length, int(stop))
+            for (candidate, length), stop in zip(lengths.items(), stops)
+        },
+        dates=rows["Date"].to_numpy(dtype="datetime64[ns]"),
+    )
+
+
+def extend_candidate_series(
+    series: CandidateSeries,
+    added: pd.DataFrame,
+    blocks: npt.NDArray[np.intp],
+    at_start: bool,
+) -> CandidateSeries:
+    """
+    This function merges the rows a refresh added into a candidate series without re-sorting it
+
+    Each added row's position is a binary search within its candidate's rows, and the merged rows
+    are one take over the existing and added rows.
+
+    inputs:
+        series - CandidateSeries: The existing rows
+        added - dataframe: The added rows with the same columns, ordered by candidate (in the order of
+            series.bounds) and then date
+        blocks - array: Each added row's candidate position in series.bounds
+        at_start - bool: Whether the rows were added before the existing ones in the source, so they
+            come first among rows sharing a candidate and date
+
+    returns:
+        series - CandidateSeries: The existing and added rows, ordered by candidate and then date
+    """
+    n_before = len(series.rows)
+    added_dates = added["Date"].to_numpy(dtype="datetime64[ns]")
+    side: Any = "left" if at_start else "right"
+
+    insert_at = np.empty(len(added), dtype=np.intp)
+    for block, (start, stop) in enumerate(series.bounds.values()):
+        selected = blocks == block
+        insert_at[selected] = start + np.searchsorted(
+            series.dates[start:stop], added_dates[selected], side=side
+        )
+
+    # Added rows are in merged order, so each lands after the added rows before it
+    positions = insert_at + np.arange(len(added))
+    is_added = np.zeros(n_before + len(added), dtype=bool)
+    is_added[positions] = True
+    order = np.empty(n_before + len(added), dtype=np.intp)
+    order[positions] = n_before + np.arange(len(added))
+    order[~is_added] = np.arange(n_before)
+
+    added_counts = np.bincount(blocks, minlength=len(series.bounds))
+
+    return _ordered_series(
+        pd.concat([series.rows, added], ignore_index=True)
+        .take(order)
+        .reset_index(drop=True),
+        {
+            candidate: stop - start + int(count)
+            for (candidate, (start, stop)), count in zip(
+                series.bounds.items(), added_counts
+            )
+        },
+    )
+
+
+@dataclass(frozen=True)
+class VotingKpis:
+    """
+    Every candidate's national average and rank on every polling date, with a dense daily calendar
+    mapping any start date to the first polling date on or after it
+
+    attributes:
+        first_day - datetime64: The first polling date
+        candidates - dict: Each candidate's column in ranks and values
+        since - array: For each calendar day from first_day on, the row of the first polling date on
+            or after it (the last row, which is all zeros, when there is none)
+        ranks - array: Each candidate's position by polling date (0 when they have no poll that day)
+        values - array: Each candidate's Percentage by polling date (0 when they have no poll that day)
+    """
+
+    first_day: np.datetime64
+    candidates: Dict[str, int]
+    since: npt.NDArray[np.intp]
+    ranks: npt.NDArray[np.int64]
+    values: npt.NDArray[np.float64]
+
+    def current(self, candidate: str) -> Tuple[int, float]:
+        """
+        This function looks up a candidate's position and vote % on the latest polling date
+
+        inputs:
+            candidate - str: The candidate
+
+        returns:
+            standing - tuple: The position and vote %, or zeros if they weren't polled that day
+        """
+        return self._standing(candidate, len(self.ranks) - 2)
+
+    def at(self, candidate: str, start_date: Any) -> Tuple[int, float]:
+        """
+        This function looks up a candidate's position and vote % on the first polling date on or after a date
+
+        inputs:
+            candidate - str: The candidate
+            start_date - date: The date
+
+        returns:
+            standing - tuple: The position and vote %, or zeros if they weren't polled that day
+        """
+        return self._standing(
+            candidate, _since_row(self.first_day, self.since, start_date)
+        )
+
+    def _standing(self, candidate: str, row: int) -> Tuple[int, float]:
+        column = self.candidates.get(candidate)
+        if column is None or row < 0:
+            return 0, 0
+
+        return int(self.ranks[row, column]), float(self.values[row, column])
+
+
+@dataclass(frozen=True)
+class FavorabilityKpis:
+    """
+    Positions of each candidate's latest poll and of their first poll on or after every calendar day
+
+    attributes:
+        first_day - datetime64: The first polling date
+        candidates - dict: Each candidate's column in since and position in latest
+        since - array: For each calendar day from first_day on and each candidate, the row in values of
+            their first poll on or after it (-1 when there is none)
+        latest - array: Each candidate's row in values of the first poll on their latest polling date
+        values - array: Favorable and Unfavorable of every poll
+    """
+
+    first_day: np.datetime64
+    candidates: Dict[str, int]
+    since: npt.NDArray[np.intp]
+    latest: npt.NDArray[np.intp]
+    values: npt.NDArray[np.float64]
+
+    def current(self, candidate: str) -> Optional[Dict[str, float]]:
+        """
+        This function looks up a candidate's latest favorability
+
+        inputs:
+            candidate - str: The candidate
+
+        returns:
+            result - dict: Favorable and Unfavorable, or None if the candidate has no polls
+        """
+        column = self.candidates.get(candidate)
+        if column is None:
+            return None
+
+        return self._result(int(self.latest[column]))
+
+    def at(self, candidate: str, start_date: Any) -> Optional[Dict[str, float]]:
+        """
+        This function looks up a candidate's first favorability poll on or after a date
+
+        inputs:
+            candidate - str: The candidate
+            start_date - date: The date
+
+        returns:
+            result - dict: Favorable and Unfavorable, or None if there is no such poll
+        """
+        column = self.candidates.get(candidate)
+        if column is None:
+            return None
+
+        row = _since_row(self.first_day, self.since[:, column], start_date)
+
+        return self._result(row) if row >= 0 else None
+
+    def _result(self, row: int) -> Dict[str, float]:
+        return dict(zip(favorability_columns, map(float, self.values[row])))
+
+
+def _since_row(
+    first_day: np.datetime64, since: npt.NDArray[np.intp], start_date: Any
+) -> int:
+    # The calendar's last entry is the "nothing this recent" sentinel
+    offset = int((_day(start_date).astype("datetime64[D]") - first_day).astype(int))
+
+    return int(since[min(max(offset, 0), len(since) - 1)])
+
+
+def _calendar(days: npt.NDArray[np.datetime64]) -> npt.NDArray[np.datetime64]:
+    # Every day from the first polling date to the day after the last
+    return np.arange(days[0], days[-1] + np.timedelta64(2, "D"), dtype="datetime64[D]")
+
+
+def voting_kpis(trend: CandidateSeries) -> VotingKpis:
+    """
+    This function builds the per-date position and vote % tables behind the voting KPI card
+
+    Candidates are ranked by their best result of the day and show the day's first result, as the
+    KPI card always has.
+
+    inputs:
+        trend - CandidateSeries: The national polling averages by candidate and date
+
+    returns:
+        kpis - VotingKpis: The lookup tables
+    """
+    candidates = {name: column for column, name in enumerate(trend.bounds)}
+    days = trend.dates.astype("datetime64[D]")
+    distinct_days = np.unique(days)
+    n_days, n_candidates = len(distinct_days), len(candidates)
+
+    ranks = np.zeros((n_days + 1, n_candidates), dtype=np.int64)
+    values = np.zeros((n_days + 1, n_candidates))
+    if n_days == 0:
+        return VotingKpis(
+            np.datetime64("NaT", "D"), candidates, np.zeros(1, np.intp), ranks, values
+        )
+
+    columns = np.repeat(
+        [candidates[name] for name in trend.bounds],
+        [stop - start for start, stop in trend.bounds.values()],
+    )
+    rows = np.searchsorted(distinct_days, days)
+    percentages = trend.rows["Percentage"].to_numpy(dtype=np.float64)
+
+    # Rows are ordered by candidate and date, so each (candidate, date) is a contiguous block
+    firsts = np.flatnonzero(
+        np.append(True, (columns[1:] != columns[:-1]) | (rows[1:] != rows[:-1]))
+    )
+    best = np.full((n_days, n_candidates), np.nan)
+    best[rows[firsts], columns[firsts]] = np.fmax.reduceat(percentages, firsts)
+    present = np.zeros((n_days, n_candidates), dtype=bool)
+    present[rows[firsts], columns[firsts]] = True
+    values[rows[firsts], columns[firsts]] = np.nan_to_num(percentages[firsts])
+
+    # Absent candidates sort last; ties keep candidate order
+    keys = np.where(
+        present, np.where(np.isnan(best), np.finfo(float).max, -best), np.inf
+    )
+    order = np.argsort(keys, axis=1, kind="stable")
+    np.put_along_axis(
+        ranks[:n_days], order, np.arange(1, n_candidates + 1)[None, :], axis=1
+    )
+    ranks[:n_days][~present] = 0
+
+    return VotingKpis(
+        first_day=distinct_days[0],
+        candidates=candidates,
+        since=np.searchsorted(distinct_days, _calendar(distinct_days)),
+        ranks=ranks,
+        values=values,
+    )
+
+
+def _candidate_since(
+    days: npt.NDArray[np.datetime64], start: int, calendar: npt.NDArray[np.datetime64]
+) -> Tuple[npt.NDArray[np.intp], int]:
+    # The row of the candidate's first poll on or after every calendar day (-1 when there is none)
+    # and of the first poll on their latest polling date
+    positions = start + np.searchsorted(days, calendar)
+
+    return (
+        np.where(positions < start + len(days), positions, -1),
+        start + int(np.searchsorted(days, days[-1])),
+    )
+
+
+def favorability_kpis(polls: CandidateSeries) -> FavorabilityKpis:
+    """
+    This function builds the per-date poll positions behind the favorability KPI card
+
+    inputs:
+        polls - CandidateSeries: The national favorability polls by candidate and date
+
+    returns:
+        kpis - FavorabilityKpis: The lookup tables
+    """
+    candidates = {name: column for column, name in enumerate(polls.bounds)}
+    values = polls.rows[favorability_columns].to_numpy(dtype=np.float64)
+    days = polls.dates.astype("datetime64[D]")
+    if len(days) == 0:
+        return FavorabilityKpis(
+            np.datetime64("NaT", "D"),
+            candidates,
+            np.full((1, 0), -1, np.intp),
+            np.zeros(0, np.intp),
+            values,
+        )
+
+    # Each candidate's days are sorted, so the first and last days are at the ends of their rows
+    calendar = _calendar(
+        np.array(
+            [
+                min(days[start] for start, _ in polls.bounds.values()),
+                max(days[stop - 1] for _, stop in polls.bounds.values()),
+            ]
+        )
+    )
+    since = np.full((len(calendar), len(candidates)), -1, dtype=np.intp)
+    latest = np.zeros(len(candidates), dtype=np.intp)
+    for column, (start, stop) in enumerate(polls.bounds.values()):
+        since[:, column], latest[column] = _candidate_since(
+            days[start:stop], start, calendar
+        )
+
+    return FavorabilityKpis(
+        first_day=calendar[0],
+        candidates=candidates,
+        since=since,
+        latest=latest,
+        values=values,
+    )
+
+
+def extend_favorability_kpis(
+    kpis: FavorabilityKpis, previous: CandidateSeries, polls: CandidateSeries
+) -> FavorabilityKpis:
+    """
+    This function updates the favorability KPI tables after polls were merged into a candidate series
+
+    Candidates without new polls keep their positions, shifted past the polls inserted before them;
+    only candidates with new polls are searched again.
+
+    inputs:
+        kpis - FavorabilityKpis: The tables of the previous polls
+        previous - CandidateSeries: The previous polls
+        polls - CandidateSeries: The previous polls with the added ones merged in, with the same
+            candidates in the same order
+
+    returns:
+        kpis - FavorabilityKpis: The lookup tables
+    """
+    if not len(previous.rows):
+        return favorability_kpis(polls)
+
+    bounds = list(zip(previous.bounds.values(), polls.bounds.values()))
+    changed = [
+        stop - start != old_stop - old_start
+        for (old_start, old_stop), (start, stop) in bounds
+    ]
+
+    # The calendar only grows to cover the new polls of the candidates that gained some
+    first_day = kpis.first_day
+    last_day = kpis.first_day + np.timedelta64(len(kpis.since) - 2, "D")
+    for (start, stop), candidate_changed in zip(polls.bounds.values(), changed):
+        if candidate_changed:
+            first_day = min(first_day, polls.dates[start].astype("datetime64[D]"))
+            last_day = max(last_day, polls.dates[stop - 1].astype("datetime64[D]"))
+    calendar = _calendar(np.array([first_day, last_day]))
+    front = int((kpis.first_day - first_day).astype(int))
+
+    since = np.full((len(calendar), len(bounds)), -1, dtype=np.intp)
+    latest = np.zeros(len(bounds), dtype=np.intp)
+    for column, (((old_start, _), (start, stop)), candidate_changed) in enumerate(
+        zip(bounds, changed)
+    ):
+        if candidate_changed:
+            since[:, column], latest[column] = _candidate_since(
+                polls.dates[start:stop].astype("datetime64[D]"), start, calendar
+            )
+        else:
+            # Days before the old calendar fall back to the candidate's first poll, and days after
+            # it have no poll, as before
+            shift = start - old_start
+            previous_since = kpis.since[:, column]
+            since[:front, column] = previous_since[0] + shift
+            since[front : front + len(previous_since), column] = np.where(
+                previous_since >= 0, previous_since + shift, -1
+            )
+            latest[column] = kpis.latest[column] + shift
+
+    return FavorabilityKpis(
+        first_day=calendar[0],
+        candidates=kpis.candidates,
+        since=since,
+        latest=latest,
+        values=polls.rows[favorability_columns].to_numpy(dtype=np.float64),
+    )
+
+
+def row_hashes(df: pd.DataFrame) -> npt.NDArray[np.uint64]:
+    """
+    This function hashes each row of a dataframe by value, ignoring its index
+
+    inputs:
+        df - dataframe: A polling dataset
+
+    returns:
+        hashes - array: One hash per row
+    """
+    hashes: npt.NDArray[np.uint64] = pd.util.hash_pandas_object(
+        df, index=False
+    ).to_numpy(dtype=np.uint64)
+
+    return hashes
+
+
+def added_rows(
+    hashes_before: npt.NDArray[np.uint64],
+    df: pd.DataFrame,
+    hashes: npt.NDArray[np.uint64],
+) -> Optional[Tuple[pd.DataFrame, bool]]:
+    """
+    This function finds the rows added to a dataset when a refresh only added rows at one end
+
+    inputs:
+        hashes_before - array: Row hashes of the previous version of the dataset
+        df - dataframe: The new version of the dataset
+        hashes - array: Row hashes of the new version, as computed for its dataset version
+
+    returns:
+        added - tuple: The added rows and whether they were added before the existing rows, or None
+            if existing rows changed or were removed
+    """
+    n_before = len(hashes_before)
+    n_added = len(hashes) - n_before
+    if n_added < 0:
+        return None
+
+    if np.array_equal(hashes[:n_before], hashes_before):
+        return df.iloc[n_before:], False
+
+    if np.array_equal(hashes[n_added:], hashes_before):
+        return df.iloc[:n_added], True
+
+    return None
+
+
+def latest_per_candidate(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    This function picks each candidate's most recent row (the first one when several share that date)
+
+    inputs:
+        df - dataframe: Polling rows with Candidate and Date columns
+
+    returns:
+        df - dataframe: One row per candidate, ordered by candidate name
+    """
+    df = df[df["Candidate"].notna() & df["Date"].notna()]
+
+    # By name rather than category order, so charts list the candidates alphabetically
+    return (
+        df.sort_values("Date", ascending=False, kind="stable")
+        .drop_duplicates("Candidate")
+        .sort_values("Candidate", key=lambda names: names.astype(str), kind="stable")
+    )
+
+
+def _extend_latest(
+    latest: pd.DataFrame, added: pd.DataFrame, newest: Dict[str, int], at_start: bool
+) -> pd.DataFrame:
+    # A candidate's newest added poll replaces their latest one if it is more recent, or as recent
+    # and listed before it
+    latest_days = dict(
+        zip(
+            latest["Candidate"].astype(str),
+            latest["Date"].to_numpy(dtype="datetime64[ns]"),
+        )
+    )
+    added_days = added["Date"].to_numpy(dtype="datetime64[ns]")
+    replaced = sorted(
+        candidate
+        for candidate, row in newest.items()
+        if added_days[row] > latest_days[candidate]
+        or (at_start and added_days[row] == latest_days[candidate])
+    )
+    if not replaced:
+        return latest
+
+    rows = added.iloc[[newest[candidate] for candidate in replaced]]
+    if len(replaced) == len(latest):
+        return rows
+
+    return pd.concat(
+        [latest[~latest["Candidate"].astype(str).isin(replaced)], rows]
+    ).sort_values("Candidate", key=lambda names: names.astype(str), kind="stable")
+
+
+def voting_trend(
+    df: pd.DataFrame, spec: RollingSpec = rolling.default_spec
+) -> pd.DataFrame:
+    """
+    This function computes every candidate's national polling average trend
+
+    inputs:
+        df - dataframe: The national polling averages
+        spec - RollingSpec: The rolling average to apply
+
+    returns:
+        trend - dataframe: Candidate, Date, Percentage and Rolling, ordered by candidate and date
+    """
+    trend = (
+        df.loc[df["Candidate"].notna(), ["Candidate", "Date", "Percentage"]]
+        .sort_values(["Candidate", "Date"], kind="stable")
+        .reset_index(drop=True)
+    )
+    trend["Rolling"] = rolling.rolling_mean(trend, "Percentage", spec)
+
+    return trend
+
+
+def favorability_trend(df: pd.DataFrame, spec: RollingSpec) -> pd.DataFrame:
+    """
+    This function computes every candidate's favorability trend from the individual polls
+
+    The default trend instead averages daily means (see FavorabilityViews.daily); averaging the polls
+    themselves lets sample size weights and calendar windows apply to each poll.
+
+    inputs:
+        df - dataframe: The national favorability polls
+        spec - RollingSpec: The rolling average to apply
+
+    returns:
+        trend - dataframe: Candidate, Date and the rolling average of each favorability column, one
+            row per candidate and date
+    """
+    columns = ["Candidate", "Date"] + favorability_columns
+    if spec.weight is not None and spec.weight in df.columns:
+        columns.append(spec.weight)
+
+    polls = (
+        df.loc[df["Candidate"].notna() & df["Date"].notna(), columns]
+        .sort_values(["Candidate", "Date"], kind="stable")
+        .reset_index(drop=True)
+    )
+    for column in favorability_columns:
+        polls[f"Rolling {column}"] = rolling.rolling_mean(polls, column, spec)
+
+    # With calendar windows every poll on a date has the same average; keep the day's last one
+    return polls.drop_duplicates(["Candidate", "Date"], keep="last").drop(
+        columns=columns[2:]
+    )
+
+
+def national_avg_views(df: pd.DataFrame) -> NationalAvgViews:
+    """
+    This function builds the national polling average views from scratch
+
+    inputs:
+        df - dataframe: The national polling averages
+
+    returns:
+        views - NationalAvgViews: The latest row and rolling trend of every candidate
+    """
+    trend = candidate_series(voting_trend(df))
+
+    return NationalAvgViews(
+        latest=latest_per_candidate(df),
+        trend=trend,
+        kpis=voting_kpis(trend),
+    )
+
+
+def _favorability_totals(
+    rows: pd.DataFrame,
+    dates: npt.NDArray[np.datetime64],
+    candidate_starts: List[int],
+) -> Tuple[npt.NDArray[np.intp], npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    # Rows are ordered by candidate and date, so each (candidate, date) is a contiguous block that
+    # starts wherever the candidate or the date changes
+    first = np.zeros(len(dates), dtype=bool)
+    first[candidate_starts] = True
+    first[1:] |= dates[1:] != dates[:-1]
+    starts = np.flatnonzero(first)
+
+    if not len(starts):
+        empty = np.zeros((0, len(favorability_columns)), dtype=np.int64)
+        return starts, empty, empty
+
+    values = rows[favorability_columns].to_numpy(dtype=np.float64)
+    observed = ~np.isnan(values)
+    scaled = np.round(np.where(observed, values, 0) * total_scale).astype(np.int64)
+
+    return (
+        starts,
+        np.add.reduceat(scaled, starts),
+        np.add.reduceat(observed.astype(np.int64), starts),
+    )
+
+
+def _favorability_daily(
+    candidates: pd.Series,
+    dates: npt.NDArray[np.datetime64],
+    sums: npt.NDArray[np.int64],
+    counts: npt.NDArray[np.int64],
+) -> pd.DataFrame:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.round(sums / counts / total_scale, 2)
+
+    daily = pd.DataFrame(
+        {
+            "Candidate": candidates.reset_index(drop=True),
+            "Date": dates,
+            **{column: means[:, i] for i, column in enumerate(favorability_columns)},
+        }
+    )
+
+    for column in favorability_columns:
+        daily[f"Rolling {column}"] = rolling.rolling_mean(
+            daily, column, rolling.default_spec
+        )
+
+    return daily
+
+
+def favorability_views(df: pd.DataFrame) -> FavorabilityViews:
+    """
+    This function builds the national favorability views from scratch
+
+    inputs:
+        df - dataframe: The national favorability polls
+
+    returns:
+        views - FavorabilityViews: The latest poll and daily averages of every candidate
+    """
+    polls = candidate_series(df[["Candidate", "Date"] + favorability_columns])
+    starts, sums, counts = _favorability_totals(
+        polls.rows, polls.dates, [start for start, _ in polls.bounds.values()]
+    )
+
+    # Each candidate's days are the day blocks starting within their polls
+    day_bounds = np.searchsorted(starts, list(polls.bounds.values()))
+    trend = _ordered_series(
+        _favorability_daily(
+            polls.rows["Candidate"].iloc[starts], polls.dates[starts], sums, counts
+        ),
+        {
+            candidate: int(stop - start)
+            for candidate, (start, stop) in zip(polls.bounds, day_bounds)
+        },
+    )
+
+    return FavorabilityViews(
+        row_hashes=row_hashes(df),
+        latest=latest_per_candidate(df),
+        sums=sums,
+        counts=counts,
+        trend=trend,
+        polls=polls,
+        kpis=favorability_kpis(polls),
+    )
+
+
+def extend_favorability_views(
+    views: FavorabilityViews, df: pd.DataFrame, hashes: npt.NDArray[np.uint64]
+) -> Optional[FavorabilityViews]:
+    """
+    This function updates the national favorability views with the polls a refresh added
+
+    Only the added polls are read: their sums and counts are folded into the daily totals of the
+    candidates that gained polls, and only those candidates have their daily averages recomputed.
+
+    inputs:
+        views - FavorabilityViews: Views of the previous version of the dataset
+        df - dataframe: The new version of the dataset
+        hashes - array: Row hashes of the new version, as computed for its dataset version
+
+    returns:
+        views - FavorabilityViews: The updated views, or None if the refresh did more than add rows
+            or added a candidate
+    """
+    found = added_rows(views.row_hashes, df, hashes)
+    if found is None:
+        return None
+
+    added, at_start = found
+    candidate_dtype = views.polls.rows["Candidate"].dtype
+    if added["Candidate"].dtype != candidate_dtype:
+        return None
+
+    rows = np.flatnonzero(
+        added["Candidate"].notna().to_numpy() & added["Date"].notna().to_numpy()
+    )
+    if not len(rows):
+        return replace(views, row_hashes=hashes)
+
+    # Position of each added poll's candidate in the existing candidate order
+    candidates = list(views.polls.bounds)
+    code_blocks = pd.Index(candidates).get_indexer(
+        candidate_dtype.categories.astype(str)
+    )
+    blocks = code_blocks[added["Candidate"].cat.codes.to_numpy()[rows]]
+    if (blocks < 0).any():
+        return None
+
+    # The added polls ordered by candidate and date, summed per (candidate, date)
+    order = np.lexsort((added["Date"].to_numpy(dtype="datetime64[ns]")[rows], blocks))
+    rows = rows[order]
+    blocks = blocks[order]
+    polls_added = added.iloc[
+        rows, added.columns.get_indexer(["Candidate", "Date"] + favorability_columns)
+    ]
+    added_dates = polls_added["Date"].to_numpy(dtype="datetime64[ns]")
+    added_starts, added_sums, added_counts = _favorability_totals(
+        polls_added, added_dates, list(np.flatnonzero(np.diff(blocks, prepend=-1)))
+    )
+    added_days = added_dates[added_starts]
+    added_blocks = blocks[added_starts]
+
+    # Each candidate's newest added poll starts their last added day
+    last_days = np.flatnonzero(np.diff(added_blocks, append=-1))
+    latest = _extend_latest(
+        views.latest,
+        added,
+        {
+            candidates[block]: int(row)
+            for block, row in zip(
+                added_blocks[last_days], rows[added_starts[last_days]]
+            )
+        },
+        at_start,
+    )
+
+    sums: List[npt.NDArray[np.int64]] = []
+    counts: List[npt.NDArray[np.int64]] = []
+    days: List[npt.NDArray[np.datetime64]] = []
+    affected: List[bool] = []
+    for block, (start, stop) in enumerate(views.trend.bounds.values()):
+        block_sums = views.sums[start:stop]
+        block_counts = views.counts[start:stop]
+        block_days = views.trend.dates[start:stop]
+
+        selected = added_blocks == block
+        if selected.any():
+            # Add into the days the candidate already has and insert the new ones
+            positions = np.searchsorted(block_days, added_days[selected])
+            existing = positions < len(block_days)
+            existing[existing] = (
+                block_days[positions[existing]] == added_days[selected][existing]
+            )
+
+            block_sums = block_sums.copy()
+            block_counts = block_counts.copy()
+            block_sums[positions[existing]] += added_sums[selected][existing]
+            block_counts[positions[existing]] += added_counts[selected][existing]
+
+            new = positions[~existing]
+            block_sums = np.insert(
+                block_sums, new, added_sums[selected][~existing], axis=0
+            )
+            block_counts = np.insert(
+                block_counts, new, added_counts[selected][~existing], axis=0
+            )
+            block_days = np.insert(block_days, new, added_days[selected][~existing])
+
+        sums.append(block_sums)
+        counts.append(block_counts)
+        days.append(block_days)
+        affected.append(bool(selected.any()))
+
+    # Recompute the daily averages of the candidates that gained polls in one pass
+    lengths = {
+        candidate: len(block_days)
+        for candidate, block_days in zip(views.trend.bounds, days)
+    }
+    recomputed = _favorability_daily(
+        pd.Series(
+            pd.Categorical.from_codes(
+                np.repeat(
+                    candidate_dtype.categories.get_indexer(
+                        [c for c, changed in zip(lengths, affected) if changed]
+                    ),
+                    [n for n, changed in zip(lengths.values(), affected) if changed],
+                ),
+                dtype=candidate_dtype,
+            )
+        ),
+        np.concatenate([d for d, changed in zip(days, affected) if changed]),
+        np.concatenate([s for s, changed in zip(sums, affected) if changed]),
+        np.concatenate([c for c, changed in zip(counts, affected) if changed]),
+    )
+
+    # Unless every candidate gained polls, the others keep their rows
+    trend = recomputed
+    if not all(affected):
+        trend_rows: List[pd.DataFrame] = []
+        offset = 0
+        for (start, stop), length, changed in zip(
+            views.trend.bounds.values(), lengths.values(), affected
+        ):
+            if changed:
+                trend_rows.append(recomputed.iloc[offset : offset + length])
+                offset += length
+            else:
+                trend_rows.append(views.trend.rows.iloc[start:stop])
+        trend = pd.concat(trend_rows, ignore_index=True)
+
+    polls = extend_candidate_series(views.polls, polls_added, blocks, at_start)
+
+    return FavorabilityViews(
+        row_hashes=hashes,
+        latest=latest,
+        sums=np.concatenate(sums),
+        counts=np.concatenate(counts),
+        trend=_ordered_series(trend, lengths),
+        polls=polls,
+        kpis=extend_favorability_kpis(views.kpis, views.polls, polls),
+    )
@@ -0,0 +1,123 @@
+"""
+Times extending the national favorability views with the polls a refresh added against rebuilding
+them, and checks both give the same views
+
+Run from the repository root: python -m scripts.bench_favorability_views
+"""
+import timeit
+from typing import Callable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from dashboard.elections import views
+
+# (existing polls, polls added by the refresh)
+cases = [(2_000, 20), (80_000, 300)]
+
+
+def synthetic_polls(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    This function builds a favorability dataset shaped like the cleaned FiveThirtyEight one, newest first
+
+    inputs:
+        n_rows - int: Number of polls
+        seed - int: Seed for the random values
+
+    returns:
+        df - dataframe: Candidate, Date, favorability columns and sample size of every poll
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp("2021-01-01") + pd.to_timedelta(
+        np.sort(rng.integers(0, 1_000, n_rows))[::-1], unit="D"
+    )
+
+    return pd.DataFrame(
+        {
+            "poll_id": rng.integers(0, 9_000, n_rows),
+            "Candidate": pd.Categorical(
+                rng.choice(["Trump", "Haley"], n_rows), categories=["Trump", "Haley"]
+            ),
+            "Favorable": rng.uniform(20, 60, n_rows).round(1),
+            "Unfavorable": rng.uniform(20, 60, n_rows).round(1),
+            "sample_size": rng.integers(300, 3_000, n_rows).astype(np.float64),
+            "Date": dates,
+        }
+    )
+
+
+def assert_same_views(
+    extended: views.FavorabilityViews, rebuilt: views.FavorabilityViews
+) -> None:
+    """
+    This function checks an extended set of views against a rebuild of the same dataset
+
+    inputs:
+        extended - FavorabilityViews: Views extended with the added polls
+        rebuilt - FavorabilityViews: Views built from scratch
+    """
+    np.testing.assert_array_equal(extended.row_hashes, rebuilt.row_hashes)
+    pd.testing.assert_frame_equal(
+        extended.latest.reset_index(drop=True), rebuilt.latest.reset_index(drop=True)
+    )
+    np.testing.assert_array_equal(extended.sums, rebuilt.sums)
+    np.testing.assert_array_equal(extended.counts, rebuilt.counts)
+    for series in ("trend", "polls"):
+        a, b = getattr(extended, series), getattr(rebuilt, series)
+        pd.testing.assert_frame_equal(a.rows, b.rows)
+        assert a.bounds == b.bounds
+        np.testing.assert_array_equal(a.dates, b.dates)
+    for table in ("first_day", "candidates", "since", "latest", "values"):
+        np.testing.assert_array_equal(
+            getattr(extended.kpis, table), getattr(rebuilt.kpis, table)
+        )
+
+
+def best_ms(function: Callable[[], object]) -> float:
+    return min(timeit.repeat(function, number=1, repeat=7)) * 1000
+
+
+def main() -> None:
+    rows: List[Tuple[int, int, float, float, float]] = []
+    for n_existing, n_added in cases:
+        df = synthetic_polls(n_existing + n_added)
+        previous = views.favorability_views(df.iloc[n_added:].reset_index(drop=True))
+
+        # The row hashes are computed once per refresh for the dataset version either way
+        hashes = views.row_hashes(df)
+
+        extended = views.extend_favorability_views(previous, df, hashes)
+        assert extended is not None
+        assert_same_views(extended, views.favorability_views(df))
+
+        # Sources listed oldest first gain their polls at the end instead
+        oldest_first = df.iloc[::-1].reset_index(drop=True)
+        appended = views.extend_favorability_views(
+            views.favorability_views(oldest_first.iloc[:n_existing]),
+            oldest_first,
+            views.row_hashes(oldest_first),
+        )
+        assert appended is not None
+        assert_same_views(appended, views.favorability_views(oldest_first))
+
+        rows.append(
+            (
+                n_existing,
+                n_added,
+                best_ms(lambda: views.row_hashes(df)),
+                best_ms(lambda: views.favorability_views(df)),
+                best_ms(lambda: views.extend_favorability_views(previous, df, hashes)),
+            )
+        )
+
+    print(
+        f"{'rows':>8} {'added':>6} {'hashes ms':>10} {'rebuild ms':>11} {'extend ms':>10}"
+    )
+    for n_existing, n_added, hash_ms, rebuild_ms, extend_ms in rows:
+        print(
+            f"{n_existing:>8} {n_added:>6} {hash_ms:>10.1f} {rebuild_ms:>11.1f} {extend_ms:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Times parsing the polling CSVs with their column profiles against the python engine reading every
+column, and reports the peak memory each allocates
+
+Run from the repository root: python -m scripts.bench_parsing
+"""
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from dashboard.elections import query
+from dashboard.elections.constants import state_code_mapping
+
+# Rows of the synthetic files, about the size of the FiveThirtyEight ones
+n_average_rows = 60_000
+n_poll_rows = 200_000
+
+# Columns the dashboard never reads, padding each file out to the width of the real one
+n_extra_columns = 30
+
+politicians = [
+    "Donald Trump",
+    "Nikki Haley",
+    "Joe Biden",
+    "Ron DeSantis",
+    "Kamala Harris",
+]
+
+
+def _dates(rng: np.random.Generator, n_rows: int, date_format: str) -> pd.Series:
+    days = pd.Timestamp("2021-01-01") + pd.to_timedelta(
+        rng.integers(0, 1_000, n_rows), unit="D"
+    )
+    return pd.Series(days.strftime(date_format))
+
+
+def _with_extra_columns(
+    rng: np.random.Generator, columns: Dict[str, object], n_rows: int
+) -> pd.DataFrame:
+    extra = rng.integers(0, 1_000, (n_rows, n_extra_columns))
+    return pd.DataFrame(
+        {**columns, **{f"extra_{i}": extra[:, i] for i in range(n_extra_columns)}}
+    )
+
+
+def synthetic_csvs(directory: Path, seed: int = 0) -> Dict[str, Path]:
+    """
+    This function writes CSVs shaped like the three FiveThirtyEight polling files
+
+    inputs:
+        directory - Path: Where to write the files
+        seed - int: Seed for the random values
+
+    returns:
+        paths - dict: Each profile's name and the path of its CSV
+    """
+    rng = np.random.default_rng(seed)
+    states = list(state_code_mapping) + ["National"]
+
+    averages = _with_extra_columns(
+        rng,
+        {
+            "candidate": rng.choice(politicians, n_average_rows),
+            "pct_estimate": rng.uniform(10, 60, n_average_rows),
+            "pct_trend_adjusted": rng.uniform(10, 60, n_average_rows),
+            "date": _dates(rng, n_average_rows, "%Y-%m-%d"),
+            "state": rng.choice(states, n_average_rows),
+            "party": rng.choice(["REP", "DEM"], n_average_rows),
+            "cycle": rng.choice([2020, 2024], n_average_rows),
+        },
+        n_average_rows,
+    )
+
+    favorability_values = rng.uniform(5, 60, (n_poll_rows, 6)).round(1)
+    favorability = _with_extra_columns(
+        rng,
+        {
+            "poll_id": rng.integers(0, 9_000, n_poll_rows),
+            "politician": rng.choice(politicians, n_poll_rows),
+            **{
+                column: favorability_values[:, i]
+                for i, column in enumerate(
+                    [
+                        "favorable",
+                        "unfavorable",
+                        "very_favorable",
+                        "somewhat_favorable",
+                        "somewhat_unfavorable",
+                        "very_unfavorable",
+                    ]
+                )
+            },
+            "sample_size": rng.integers(300, 3_000, n_poll_rows),
+            "start_date": _dates(rng, n_poll_rows, "%-m/%-d/%y"),
+            "end_date": _dates(rng, n_poll_rows, "%-m/%-d/%y"),
+        },
+        n_poll_rows,
+    )
+
+    state_polls = _with_extra_columns(
+        rng,
+        {
+            "poll_id": rng.integers(0, 9_000, n_poll_rows),
+            "pollster": rng.choice(["YouGov", "Emerson", "Ipsos"], n_poll_rows),
+            "state": rng.choice(states, n_poll_rows),
+            "notes": rng.choice(["head-to-head poll", ""], n_poll_rows),
+            "party": rng.choice(["REP", "DEM"], n_poll_rows),
+            "candidate_name": rng.choice(politicians, n_poll_rows),
+            "pct": rng.uniform(10, 60, n_poll_rows).round(1),
+            "sample_size": rng.integers(300, 3_000, n_poll_rows),
+            "start_date": _dates(rng, n_poll_rows, "%-m/%-d/%y"),
+            "end_date": _dates(rng, n_poll_rows, "%-m/%-d/%y"),
+        },
+        n_poll_rows,
+    )
+
+    paths = {}
+    for name, df in (
+        ("averages", averages),
+        ("favorability", favorability),
+        ("state polls", state_polls),
+    ):
+        paths[name] = directory / f"{name.replace(' ', '_')}.csv"
+        df.to_csv(paths[name], index=False)
+
+    return paths
+
+
+def measure(parse: Callable[[], pd.DataFrame]) -> Tuple[float, float]:
+    """
+    This function times a parse and, in a second run, traces the peak memory it allocates
+
+    inputs:
+        parse - callable: Parses one CSV
+
+    returns:
+        seconds - float: Wall time of the untraced run
+        peak - float: Peak traced allocations in MB
+    """
+    start = time.perf_counter()
+    parse()
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    parse()
+    peak = tracemalloc.get_traced_memory()[1] / 1024**2
+    tracemalloc.stop()
+
+    return seconds, peak
+
+
+def main() -> None:
+    profiles = {
+        "averages": query.national_avg_profile,
+        "favorability": query.national_favorability_profile,
+        "state polls": query.state_polls_profile,
+    }
+
+    rows: List[Tuple[str, float, float, float, float]] = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name, path in synthetic_csvs(Path(directory)).items():
+            python_seconds, python_peak = measure(
+                lambda: pd.read_csv(path, engine="python")
+            )
+            profile_seconds, profile_peak = measure(
+                lambda: query.read_polling_csv(path, profiles[name])
+            )
+            rows.append(
+                (name, python_seconds, profile_seconds, python_peak, profile_peak)
+            )
+
+    print(
+        f"{'file':<14} {'python s':>9} {'profile s':>10} {'python MB':>10} {'profile MB':>11}"
+    )
+    for name, python_seconds, profile_seconds, python_peak, profile_peak in rows:
+        print(
+            f"{name:<14} {python_seconds:>9.2f} {profile_seconds:>10.2f} {python_peak:>10.0f} {profile_peak:>11.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Compares the columnar store encoding with the to_dict("records") JSON the stores used to hold, by
+payload size and the time to decode a payload back into a dataframe
+
+Run from the repository root: python -m scripts.bench_serialization
+"""
+import json
+import timeit
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+import plotly.utils
+
+from dashboard.elections import serialization
+from dashboard.elections.constants import state_code_mapping
+
+# Rows of each cleaned dataset, about the size of the FiveThirtyEight ones
+dataset_rows = {
+    "national_avg": 2_900,
+    "national_favorability": 79_600,
+    "state_polls": 59_900,
+}
+
+favorability_columns = [
+    "Favorable",
+    "Unfavorable",
+    "Very Favorable",
+    "Somewhat Favorable",
+    "Somewhat Unfavorable",
+    "Very Unfavorable",
+]
+
+
+def synthetic_datasets(seed: int = 0) -> Dict[str, pd.DataFrame]:
+    """
+    This function builds dataframes shaped like the three cleaned polling datasets
+
+    inputs:
+        seed - int: Seed for the random values
+
+    returns:
+        datasets - dict: Each polling source's name and its dataframe
+    """
+    rng = np.random.default_rng(seed)
+
+    def candidates(n_rows: int) -> pd.Categorical:
+        return pd.Categorical(rng.choice(["Trump", "Haley"], n_rows))
+
+    def dates(n_rows: int) -> pd.DatetimeIndex:
+        return pd.Timestamp("2021-01-01") + pd.to_timedelta(
+            rng.integers(0, 1_000, n_rows), unit="D"
+        )
+
+    n_avg = dataset_rows["national_avg"]
+    n_favorability = dataset_rows["national_favorability"]
+    n_state = dataset_rows["state_polls"]
+    states = rng.choice(list(state_code_mapping), n_state)
+
+    return {
+        "national_avg": pd.DataFrame(
+            {
+                "Candidate": candidates(n_avg),
+                "Date": dates(n_avg),
+                "Percentage": rng.uniform(10, 60, n_avg),
+                "state": pd.Categorical(np.repeat("National", n_avg)),
+                "pct_trend_adjusted": rng.uniform(10, 60, n_avg),
+                "cycle": np.repeat(np.int16(2024), n_avg),
+            }
+        ),
+        "national_favorability": pd.DataFrame(
+            {
+                "poll_id": rng.integers(0, 9_000, n_favorability),
+                "Candidate": candidates(n_favorability),
+                **{
+                    column: rng.uniform(5, 60, n_favorability).round(1)
+                    for column in favorability_columns
+                },
+                "sample_size": rng.integers(300, 3_000, n_favorability).astype(
+                    np.float64
+                ),
+                "Date": dates(n_favorability),
+            }
+        ),
+        "state_polls": pd.DataFrame(
+            {
+                "poll_id": rng.integers(0, 9_000, n_state),
+                "state": pd.Categorical(states),
+                # Code -1 leaves the note missing
+                "notes": pd.Categorical.from_codes(
+                    rng.integers(-1, 1, n_state), categories=["head-to-head poll"]
+                ),
+                "party": pd.Categorical(np.repeat("REP", n_state)),
+                "Candidate": candidates(n_state),
+                "Percentage": rng.uniform(10, 60, n_state).round(1),
+                "sample_size": rng.integers(300, 3_000, n_state).astype(np.float64),
+                "Date": dates(n_state),
+                "Code": pd.Series(states).map(state_code_mapping),
+            }
+        ),
+    }
+
+
+def records_payload(df: pd.DataFrame) -> str:
+    # What Dash sent for a store holding to_dict("records")
+    return json.dumps(df.to_dict("records"), cls=plotly.utils.PlotlyJSONEncoder)
+
+
+def decode_records(payload: str) -> pd.DataFrame:
+    df = pd.DataFrame(json.loads(payload))
+    df["Date"] = pd.to_datetime(df["Date"])
+    return df
+
+
+def columnar_payload(df: pd.DataFrame) -> str:
+    return json.dumps(serialization.encode_columnar(df))
+
+
+def decode_columnar(payload: str) -> pd.DataFrame:
+    return serialization.decode_columnar(json.loads(payload))
+
+
+def best_ms(function: Callable[[], Any]) -> float:
+    return min(timeit.repeat(function, number=1, repeat=5)) * 1000
+
+
+def main() -> None:
+    rows: List[Tuple[str, int, float, float, float, float]] = []
+    for name, df in synthetic_datasets().items():
+        records = records_payload(df)
+        columnar = columnar_payload(df)
+
+        # Every column round-trips, floats to within the rounding applied on decode
+        pd.testing.assert_frame_equal(
+            decode_columnar(columnar),
+            df,
+            check_dtype=False,
+            check_categorical=False,
+            atol=1e-3,
+        )
+
+        rows.append(
+            (
+                name,
+                len(df),
+                len(records) / 1024**2,
+                best_ms(lambda: decode_records(records)),
+                len(columnar) / 1024**2,
+                best_ms(lambda: decode_columnar(columnar)),
+            )
+        )
+
+    print(
+        f"{'dataset':<22} {'rows':>7} {'records MB':>11} {'records ms':>11} "
+        f"{'columnar MB':>12} {'columnar ms':>12}"
+    )
+    for name, n_rows, records_mb, records_ms, columnar_mb, columnar_ms in rows:
+        print(
+            f"{name:<22} {n_rows:>7} {records_mb:>11.2f} {records_ms:>11.0f} "
+            f"{columnar_mb:>12.2f} {columnar_ms:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Tuple
+
+import pytest
+
+from dashboard.elections import fetch
+
+csv_content = b"state,pct\nPA,48.5\n"
+etag = '"v1"'
+
+
+class PollingHandler(BaseHTTPRequestHandler):
+    """
+    Serves one CSV with an ETag, answering 304 Not Modified when the client already holds it
+    """
+
+    requests_seen: List[Optional[str]] = []
+
+    def do_GET(self) -> None:
+        if_none_match = self.headers.get("If-None-Match")
+        self.requests_seen.append(if_none_match)
+
+        if if_none_match == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(csv_content)))
+        self.end_headers()
+        self.wfile.write(csv_content)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def polling_server() -> Iterator[Tuple[ThreadingHTTPServer, str]]:
+    PollingHandler.requests_seen = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PollingHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server, f"http://127.0.0.1:{server.server_address[1]}/polls.csv"
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_revalidates_then_serves_cached_copy_offline(
+    polling_server: Tuple[ThreadingHTTPServer, str], tmp_path: Path
+) -> None:
+    server, url = polling_server
+
+    # Fresh download
+    path = fetch.fetch_csv(url, cache_dir=tmp_path, timeout=5)
+    assert path.read_bytes() == csv_content
+    assert fetch.read_meta(path.with_name(path.name + ".meta.json"))["etag"] == etag
+
+    # Revalidated with the saved ETag and answered 304
+    modified = path.stat().st_mtime_ns
+    assert fetch.fetch_csv(url, cache_dir=tmp_path, timeout=5) == path
+    assert path.stat().st_mtime_ns == modified
+    assert PollingHandler.requests_seen == [None, etag]
+
+    # Server gone, so the cached copy is served
+    server.shutdown()
+    server.server_close()
+    assert fetch.fetch_csv(url, cache_dir=tmp_path, timeout=5).read_bytes() == (
+        csv_content
+    )
+
+    assert not list(tmp_path.glob("*.partial"))
+
+
+def test_fetch_treats_unreadable_meta_as_missing(
+    polling_server: Tuple[ThreadingHTTPServer, str], tmp_path: Path
+) -> None:
+    _, url = polling_server
+
+    path = fetch.fetch_csv(url, cache_dir=tmp_path, timeout=5)
+    meta_path = path.with_name(path.name + ".meta.json")
+    meta_path.write_text('{"etag": "v1"')
+
+    assert fetch.fetch_csv(url, cache_dir=tmp_path, timeout=5).read_bytes() == (
+        csv_content
+    )
+    assert PollingHandler.requests_seen == [None, None]
+    assert fetch.read_meta(meta_path)["etag"] == etag
@@ -0,0 +1,58 @@
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+import pytest
+
+from dashboard.elections import constants, func
+
+n_threads = 8
+
+# Spans two trial chunks, so each run draws from more than one seed stream
+n_trials = 60_000
+
+
+def scenarios() -> List[Tuple[int, Dict[str, Any]]]:
+    codes = list(constants.states)
+
+    return [
+        (seed, {code: "Trump" if i % 2 else "Opposition" for code in codes[i : i + 3]})
+        for i, seed in enumerate(range(100, 100 + n_threads))
+    ]
+
+
+@pytest.fixture(autouse=True)
+def empty_simulation_cache() -> None:
+    func.simulation_cache.clear()
+
+
+def test_concurrent_simulations_match_serial_runs() -> None:
+    states_before = copy.deepcopy(constants.states)
+    runs = scenarios()
+
+    serial = [
+        func.election_simulation_monte_carlo(n_trials, hypo_dict, seed)
+        for seed, hypo_dict in runs
+    ]
+
+    # Run again from an empty cache so every thread simulates rather than reading a cached result
+    func.simulation_cache.clear()
+    start = threading.Barrier(n_threads)
+
+    def run(seed: int, hypo_dict: Dict[str, Any]) -> Tuple[pd.DataFrame, float]:
+        start.wait()
+        return func.election_simulation_monte_carlo(n_trials, hypo_dict, seed)
+
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
+        futures = [executor.submit(run, seed, hypo_dict) for seed, hypo_dict in runs]
+        concurrent = [future.result() for future in futures]
+
+    for (serial_df, serial_pct), (concurrent_df, concurrent_pct) in zip(
+        serial, concurrent
+    ):
+        pd.testing.assert_frame_equal(serial_df, concurrent_df)
+        assert serial_pct == concurrent_pct
+
+    assert constants.states == states_before